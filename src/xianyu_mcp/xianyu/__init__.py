@@ -2,7 +2,7 @@
 闲鱼自动化核心模块
 """
 
-from .browser import XianyuBrowser
+from .browser import XianyuBrowser, BrowserPool
 from .login import XianyuLogin
 from .search import XianyuSearch, XianyuItem
 from .publish import XianyuPublish, PublishParams
@@ -11,6 +11,7 @@ from .analytics import XianyuAnalytics, ItemStats, SalesStats, TrafficStats
 
 __all__ = [
     "XianyuBrowser",
+    "BrowserPool",
     "XianyuLogin",
     "XianyuSearch",
     "XianyuItem",
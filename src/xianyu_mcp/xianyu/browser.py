@@ -5,9 +5,11 @@
 """
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from contextlib import asynccontextmanager
 from pathlib import Path
 from loguru import logger
-from typing import Optional
+from typing import AsyncIterator, List, Optional
+import asyncio
 
 from ..config import settings
 
@@ -32,6 +34,7 @@ class XianyuBrowser:
         self.browser: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self._playwright = None
+        self._is_tab = False
         
         logger.info(f"初始化浏览器 - 用户数据目录：{self.user_data_dir}, 无头模式：{self.headless}")
     
@@ -76,6 +79,25 @@ class XianyuBrowser:
             await self.close()
             raise
     
+    async def new_tab(self) -> "XianyuBrowser":
+        """
+        在同一浏览器上下文中打开新标签页
+        
+        新标签页与当前实例共享 Cookie 和登录状态，关闭时只关闭该页面。
+        
+        Returns:
+            绑定到新页面的浏览器实例
+        """
+        if not self.browser:
+            raise RuntimeError("浏览器未启动")
+        
+        tab = XianyuBrowser(user_data_dir=self.user_data_dir, headless=self.headless)
+        tab.browser = self.browser
+        tab.page = await self.browser.new_page()
+        tab._is_tab = True
+        await tab._inject_stealth_script()
+        return tab
+    
     async def _inject_stealth_script(self) -> None:
         """注入反检测脚本"""
         if self.page:
@@ -134,6 +156,14 @@ class XianyuBrowser:
     async def close(self) -> None:
         """关闭浏览器"""
         try:
+            if self._is_tab:
+                # 标签页只关闭自身页面，浏览器上下文由创建者负责
+                if self.page:
+                    await self.page.close()
+                self.browser = None
+                self.page = None
+                return
+            
             if self.browser:
                 await self.browser.close()
                 logger.info("浏览器上下文已关闭")
@@ -157,3 +187,68 @@ class XianyuBrowser:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """异步上下文管理器 - 退出"""
         await self.close()
+
+
+class BrowserPool:
+    """
+    页面池
+    
+    在同一浏览器上下文中维护固定数量的标签页，供并发任务借用。
+    Playwright 的单个页面不能被多个任务同时操作，池的大小即并发上限。
+    """
+    
+    def __init__(self, browser: XianyuBrowser, size: int):
+        """
+        初始化页面池
+        
+        Args:
+            browser: 已启动的浏览器实例（其当前页面作为池中第一个页面）
+            size: 页面数量
+        """
+        self.browser = browser
+        self.size = max(1, size)
+        self._tabs: List[XianyuBrowser] = []
+        self._idle: Optional[asyncio.Queue] = None
+    
+    async def open(self) -> None:
+        """创建标签页；中途失败时关闭已创建的标签页再抛出"""
+        self._idle = asyncio.Queue()
+        self._idle.put_nowait(self.browser)
+        try:
+            for _ in range(self.size - 1):
+                tab = await self.browser.new_tab()
+                self._tabs.append(tab)
+                self._idle.put_nowait(tab)
+        except BaseException:
+            # 作为 async with 使用时 __aenter__ 失败不会触发 __aexit__，需在此清理
+            await self.close()
+            raise
+        logger.debug(f"页面池已就绪，共 {self.size} 个页面")
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[XianyuBrowser]:
+        """借用一个空闲页面，用完自动归还"""
+        if self._idle is None:
+            raise RuntimeError("页面池未打开")
+        
+        tab = await self._idle.get()
+        try:
+            yield tab
+        finally:
+            self._idle.put_nowait(tab)
+    
+    async def close(self) -> None:
+        """关闭池中新建的标签页（不关闭原始浏览器）"""
+        for tab in self._tabs:
+            await tab.close()
+        self._tabs = []
+        self._idle = None
+    
+    async def __aenter__(self):
+        """异步上下文管理器 - 进入"""
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器 - 退出"""
+        await self.close()
@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
 import json
+import random
 import re
 from loguru import logger
 
@@ -92,6 +93,12 @@ class Conversation:
 class XianyuMessage:
     """闲鱼消息类"""
     
+    _DEFAULT_REPLIES = (
+        "你好，有什么可以帮你的吗？😊",
+        "在的，请问想了解什么呢？",
+        "你好呀，商品详情都在页面上哦~",
+    )
+    
     def __init__(self, browser: XianyuBrowser):
         """
         初始化消息模块
@@ -110,6 +117,7 @@ class XianyuMessage:
             "bargain_reject": "抱歉，这个价格已经很低了",
             "sold_out": "不好意思，已经卖出了",
         }
+        self._reply_rules = self._build_reply_rules()
         self._cookies_loaded = False
         self._im_block_reason = ""
         self._api_cache: Dict[str, Dict[str, Any]] = {}
@@ -1150,86 +1158,93 @@ class XianyuMessage:
         """
         message_lower = message.lower()
         
-        # 多关键词组合匹配（更智能）
-        
-        # 1. 问候类
-        if any(kw in message_lower for kw in ["在吗", "还在", "还有", "有人吗"]):
-            return self.reply_templates["greeting"]
-        
-        # 2. 价格咨询（结合多个关键词）
-        price_keywords = ["价格", "多少钱", "便宜", "贵", "价位"]
-        if any(kw in message_lower for kw in price_keywords):
-            # 如果提到"最低"，给出底价
-            if "最低" in message_lower or "底价" in message_lower:
-                return "最低可以给你包邮，不能再少了哦~"
-            return self.reply_templates["price_confirm"]
-        
-        # 3. 运费咨询
-        shipping_keywords = ["包邮", "运费", "快递", "邮费", "发货"]
-        if any(kw in message_lower for kw in shipping_keywords):
-            # 根据地区判断
-            if any(area in message_lower for area in ["新疆", "西藏", "内蒙", "甘肃"]):
-                return "偏远地区需要补运费差价哦，其他地区都包邮~"
-            return self.reply_templates["shipping"]
-        
-        # 4. 商品状态
-        condition_keywords = ["新旧", "几成新", "状态", "用过", "瑕疵", "划痕"]
-        if any(kw in message_lower for kw in condition_keywords):
-            # 根据具体描述回复
-            if "瑕疵" in message_lower or "划痕" in message_lower:
-                return "商品很新，没有任何瑕疵，请放心~"
-            return self.reply_templates["condition"]
-        
-        # 5. 地区位置
-        location_keywords = ["哪里", "地址", "位置", "在哪", "自提"]
-        if any(kw in message_lower for kw in location_keywords):
-            location = context.get("location", "上海") if context else "上海"
-            if "自提" in message_lower:
-                return f"可以自提的，我在{location}，具体地址私聊发你~"
-            return self.reply_templates["location"].format(location=location)
-        
-        # 6. 议价（智能判断）
-        bargain_keywords = ["刀", "砍价", "便宜点", "少点", "优惠", "折扣"]
-        if any(kw in message_lower for kw in bargain_keywords):
-            # 提取具体金额
-            import re
-            price_match = re.search(r'(\d+)', message)
-            if price_match:
-                offered_price = int(price_match.group(1))
-                # 这里应该获取商品原价，暂时用固定逻辑
-                if offered_price >= 100:
-                    return f"{offered_price}元有点低，最低{int(offered_price * 1.1)}元可以吗？"
-                else:
-                    return "这个价格已经很低了，不再议价了哦~"
-            else:
-                # 没有具体金额
-                if "大刀" in message_lower:
-                    return "抱歉，小刀可以，大刀不行~"
-                elif "小刀" in message_lower:
-                    return "小刀可以，你说个价格~"
-                else:
-                    return "可以小刀，你说个心理价位~"
-        
-        # 7. 是否卖出
-        if any(kw in message_lower for kw in ["卖出", "卖掉", "还有吗", "没了"]):
-            return "还在的，可以直接拍~"
-        
-        # 8. 能否退换
-        if any(kw in message_lower for kw in ["退换", "退货", "换货", "售后"]):
-            return "个人闲置物品，非真假问题不退换，请理解~"
+        # 按优先级依次匹配，命中第一类即返回
+        for _category, keywords, handler in self._reply_rules:
+            if any(kw in message_lower for kw in keywords):
+                return handler(message, message_lower, context)
         
-        # 9. 能否见面交易
-        if any(kw in message_lower for kw in ["见面", "面交", "当面"]):
-            return "可以面交的，约个方便的时间地点~"
+        # 默认回复（友好）
+        return random.choice(self._DEFAULT_REPLIES)
+    
+    def _build_reply_rules(self) -> tuple:
+        """构建回复分派表：(类别, 关键词, 处理函数)，顺序即优先级。"""
+        return (
+            ("greeting", ("在吗", "还在", "还有", "有人吗"), self._reply_greeting),
+            ("price", ("价格", "多少钱", "便宜", "贵", "价位"), self._reply_price),
+            ("shipping", ("包邮", "运费", "快递", "邮费", "发货"), self._reply_shipping),
+            (
+                "condition",
+                ("新旧", "几成新", "状态", "用过", "瑕疵", "划痕"),
+                self._reply_condition,
+            ),
+            ("location", ("哪里", "地址", "位置", "在哪", "自提"), self._reply_location),
+            ("bargain", ("刀", "砍价", "便宜点", "少点", "优惠", "折扣"), self._reply_bargain),
+            ("availability", ("卖出", "卖掉", "还有吗", "没了"), self._reply_availability),
+            ("return", ("退换", "退货", "换货", "售后"), self._reply_return),
+            ("meetup", ("见面", "面交", "当面"), self._reply_meetup),
+        )
+    
+    def _reply_greeting(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """问候类"""
+        return self.reply_templates["greeting"]
+    
+    def _reply_price(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """价格咨询"""
+        # 如果提到"最低"，给出底价
+        if "最低" in message_lower or "底价" in message_lower:
+            return "最低可以给你包邮，不能再少了哦~"
+        return self.reply_templates["price_confirm"]
+    
+    def _reply_shipping(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """运费咨询"""
+        # 根据地区判断
+        if any(area in message_lower for area in ["新疆", "西藏", "内蒙", "甘肃"]):
+            return "偏远地区需要补运费差价哦，其他地区都包邮~"
+        return self.reply_templates["shipping"]
+    
+    def _reply_condition(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """商品状态"""
+        # 根据具体描述回复
+        if "瑕疵" in message_lower or "划痕" in message_lower:
+            return "商品很新，没有任何瑕疵，请放心~"
+        return self.reply_templates["condition"]
+    
+    def _reply_location(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """地区位置"""
+        location = context.get("location", "上海") if context else "上海"
+        if "自提" in message_lower:
+            return f"可以自提的，我在{location}，具体地址私聊发你~"
+        return self.reply_templates["location"].format(location=location)
+    
+    def _reply_bargain(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """议价（智能判断）"""
+        # 提取具体金额
+        price_match = re.search(r'(\d+)', message)
+        if price_match:
+            offered_price = int(price_match.group(1))
+            # 这里应该获取商品原价，暂时用固定逻辑
+            if offered_price >= 100:
+                return f"{offered_price}元有点低，最低{int(offered_price * 1.1)}元可以吗？"
+            return "这个价格已经很低了，不再议价了哦~"
         
-        # 10. 默认回复（友好）
-        default_replies = [
-            "你好，有什么可以帮你的吗？😊",
-            "在的，请问想了解什么呢？",
-            "你好呀，商品详情都在页面上哦~",
-        ]
-        import random
-        return random.choice(default_replies)
+        # 没有具体金额
+        if "大刀" in message_lower:
+            return "抱歉，小刀可以，大刀不行~"
+        if "小刀" in message_lower:
+            return "小刀可以，你说个价格~"
+        return "可以小刀，你说个心理价位~"
+    
+    def _reply_availability(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """是否卖出"""
+        return "还在的，可以直接拍~"
+    
+    def _reply_return(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """能否退换"""
+        return "个人闲置物品，非真假问题不退换，请理解~"
+    
+    def _reply_meetup(self, message: str, message_lower: str, context: Optional[Dict]) -> str:
+        """能否见面交易"""
+        return "可以面交的，约个方便的时间地点~"
     
     def analyze_buyer_intent(self, messages: List[str]) -> Dict[str, float]:
         """
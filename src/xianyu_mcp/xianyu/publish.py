@@ -5,15 +5,173 @@
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Sequence
 from pathlib import Path
+import asyncio
+import random
 import re
 from loguru import logger
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from .browser import XianyuBrowser
+from .browser import BrowserPool, XianyuBrowser
 from .login import XianyuLogin
 
 
+# Goofish 网页发布会直接拦截 emoji，保守移除非 BMP 字符
+_EMOJI_RE = re.compile(r"[\U00010000-\U0010FFFF]")
+_ITEM_ID_RE = re.compile(r"[?&]id=(\d+)")
+
+# 在页面内按顺序查找第一个可见元素，返回 {selector, index}；
+# 非法 CSS（Playwright 专有语法）返回 index=null，交由 Python 侧探测
+_FIRST_VISIBLE_SCRIPT = """({ selectors, start }) => {
+    for (let s = start; s < selectors.length; s++) {
+        let nodes;
+        try {
+            nodes = document.querySelectorAll(selectors[s]);
+        } catch (e) {
+            return { selector: s, index: null };
+        }
+        for (let i = 0; i < nodes.length; i++) {
+            const rect = nodes[i].getBoundingClientRect();
+            const style = getComputedStyle(nodes[i]);
+            if (rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden') {
+                return { selector: s, index: i };
+            }
+        }
+    }
+    return null;
+}"""
+
+# 返回第一个可见的价格输入框（placeholder 为 0.00）在 input.ant-input 中的下标
+_PRICE_INPUT_SCRIPT = """() => Array.from(
+    document.querySelectorAll('input.ant-input')
+).findIndex((input) => {
+    const rect = input.getBoundingClientRect();
+    return input.placeholder === '0.00'
+        && rect.width > 0 && rect.height > 0
+        && getComputedStyle(input).visibility !== 'hidden';
+})"""
+
+# 标题优化候选 emoji 与热门标签
+_TITLE_EMOJIS = ("🔥", "✨", "💯", "🎉", "⭐")
+_TITLE_TAGS = ("包邮", "全新", "急出")
+_RNG = random.Random()
+
+# 批量发布间隔（秒）：从较短间隔起步，遇到限流信号加倍，成功后衰减
+_INITIAL_PUBLISH_DELAY = 3.0
+_MIN_PUBLISH_DELAY = 2.0
+_MAX_PUBLISH_DELAY = 60.0
+_THROTTLE_MARKERS = ("风控", "频繁", "429")
+
+# 卖家操作区容器，按优先级排列
+_ACTION_CONTAINER_SELECTORS = (
+    "[class*='sellerButtonGroup']",
+    "[class*='buttons']",
+    "[class*='item-main-container']",
+)
+_ACTION_HIT_ATTR = "data-xianyu-action-hit"
+
+# 在操作区内查找最内层包含指定文案的可见元素并打上标记，与 text= 的匹配粒度一致
+_ACTION_BUTTON_SCRIPT = """({ containers, labels, marker }) => {
+    document.querySelectorAll(`[${marker}]`).forEach((node) => node.removeAttribute(marker));
+    const isVisible = (node) => {
+        const rect = node.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(node).visibility !== 'hidden';
+    };
+    for (const containerSelector of containers) {
+        const roots = document.querySelectorAll(containerSelector);
+        if (!roots.length) continue;
+        for (const label of labels) {
+            for (const root of roots) {
+                for (const node of root.querySelectorAll('*')) {
+                    if (!(node.textContent || '').includes(label)) continue;
+                    const innermost = !Array.from(node.children).some(
+                        (child) => (child.textContent || '').includes(label)
+                    );
+                    if (innermost && isVisible(node)) {
+                        node.setAttribute(marker, '1');
+                        return true;
+                    }
+                }
+            }
+        }
+    }
+    return false;
+}"""
+
+# 下架 / 删除确认弹窗文案
+_CONFIRM_DIALOG_TEXTS = ("确定要下架这个宝贝吗", "确定要删除这个宝贝吗")
+# 点击后等待确认弹窗出现的时长（毫秒）；弹窗通常几百毫秒内弹出，
+# 不弹窗直接生效的页面只多等这一小段
+_CONFIRM_DIALOG_PROBE_MS = 1000
+
+# 返回页面上出现的第一条确认弹窗文案，供 wait_for_function 轮询；未出现时返回 null。
+# 优先只读可见弹窗根节点的 textContent（不触发重排、数据量小），
+# 没有可见弹窗根节点时才回退到整页 innerText。
+_CONFIRM_DIALOG_SCRIPT = """(texts) => {
+    const roots = Array.from(
+        document.querySelectorAll('.next-dialog, .ant-modal, [role="dialog"]')
+    ).filter((node) => {
+        const rect = node.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    });
+    const text = roots.length
+        ? roots.map((node) => node.textContent || '').join('\\n')
+        : (document.body && document.body.innerText) || '';
+    return texts.find((t) => text.includes(t)) || null;
+}"""
+
+# 违禁词正则的规模上限，避免词表外置后构造出超大 alternation
+_MAX_BANNED_WORDS = 200
+_MAX_BANNED_PATTERN_CHARS = 8192
+
+# 空词表对应的正则：永不匹配（re.compile("") 会匹配任意字符串）
+_NEVER_MATCH_RE = re.compile(r"(?!)")
+
+
+def _compile_banned_words(words: Iterable[str]) -> re.Pattern:
+    """把违禁词表编译为单个 alternation 正则，超出规模上限时拒绝构建；空词表永不匹配。"""
+    words = tuple(word for word in words if word.strip())
+    if not words:
+        return _NEVER_MATCH_RE
+    if len(words) >= _MAX_BANNED_WORDS:
+        raise ValueError(f"违禁词数量过多：{len(words)}（上限 {_MAX_BANNED_WORDS}）")
+    if sum(map(len, words)) >= _MAX_BANNED_PATTERN_CHARS:
+        raise ValueError(f"违禁词总长度超过上限 {_MAX_BANNED_PATTERN_CHARS}")
+    return re.compile("|".join(map(re.escape, words)))
+
+
+# 支持上传的图片格式
+_ALLOWED_IMG_EXT = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
+
+# 发布页已知的阻塞提示文案
+_KNOWN_BLOCKER_MESSAGES = (
+    "商品描述不能包含emoji",
+    "网页版暂不支持发布此分类",
+    "请使用闲鱼APP扫码继续发布",
+)
+_BLOCKER_RE = re.compile("|".join(map(re.escape, _KNOWN_BLOCKER_MESSAGES)))
+
+# 阻塞文案 -> 结构化状态字段
+_BLOCKER_FLAG_MAP = {
+    "请使用闲鱼APP扫码继续发布": "requires_app",
+    "商品描述不能包含emoji": "emoji_blocked",
+    "网页版暂不支持发布此分类": "category_unsupported",
+}
+
+# 配送方式 -> 发布页单选项文案
+_DELIVERY_MAP = {
+    "包邮": "包邮",
+    "按距离计费": "按距离计费",
+    "一口价": "一口价",
+    "无需邮寄": "无需邮寄",
+}
+
+# 标题/描述违禁词，合并为单个正则一次扫描
+_BANNED_WORDS = ("微信", "QQ", "电话", "转账", "定金", "订金")
+_BANNED_RE = _compile_banned_words(_BANNED_WORDS)
+
+
 @dataclass
 class PublishParams:
     """发布商品参数"""
@@ -27,6 +185,8 @@ class PublishParams:
     delivery: str = "包邮"  # 配送方式
     is_original: bool = False  # 是否原创
     tags: List[str] = field(default_factory=list)  # 标签
+    # validate() 通过后缓存的图片绝对路径，供上传时跳过重复的 stat
+    _abs_images: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
     
     def validate(self) -> tuple[bool, str]:
         """
@@ -35,6 +195,8 @@ class PublishParams:
         Returns:
             (是否有效，错误信息)
         """
+        self._abs_images = []
+        
         # 标题验证
         if not self.title:
             return False, "标题不能为空"
@@ -64,19 +226,21 @@ class PublishParams:
             return False, "最多 9 张图片"
         
         # 检查图片文件是否存在
+        abs_images = []
         for img_path in self.images:
             img_file = Path(img_path)
             if not img_file.exists():
                 return False, f"图片文件不存在：{img_path}"
-            if not img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+            if img_file.suffix.lower() not in _ALLOWED_IMG_EXT:
                 return False, f"不支持的图片格式：{img_path}"
+            abs_images.append(str(img_file.absolute()))
         
-        # 违禁词检查
-        banned_words = ["微信", "QQ", "电话", "转账", "定金", "订金"]
-        for word in banned_words:
-            if word in self.title or word in self.description:
-                return False, f"标题或描述包含违禁词：{word}"
+        # 违禁词检查（放在长度校验之后，保证只扫描有界文本）
+        match = _BANNED_RE.search(self.title) or _BANNED_RE.search(self.description)
+        if match:
+            return False, f"标题或描述包含违禁词：{match.group(0)}"
         
+        self._abs_images = abs_images
         return True, ""
     
     def optimize_title(self) -> str:
@@ -91,13 +255,10 @@ class PublishParams:
             return self.title
         
         # 添加 emoji
-        emojis = ["🔥", "✨", "💯", "🎉", "⭐"]
-        import random
-        emoji = random.choice(emojis)
+        emoji = _RNG.choice(_TITLE_EMOJIS)
         
         # 添加热门标签
-        tags = ["包邮", "全新", "急出"]
-        tag = random.choice(tags)
+        tag = _RNG.choice(_TITLE_TAGS)
         
         optimized = f"{emoji} {self.title} {tag}"
         
@@ -136,6 +297,25 @@ class PublishParams:
 class XianyuPublish:
     """闲鱼发布类"""
     
+    _SUBMIT_SELECTORS = (
+        "button.publish-button--KBpTVopQ",
+        "[class*='publish-button']",
+        'button[type="submit"]',
+        'button:has-text("发布")',
+    )
+    _DESC_SELECTORS = (
+        "div[contenteditable='true']",
+        "[class*='editor']",
+        'textarea[placeholder*="描述"]',
+        'textarea[name="description"]',
+        '.description-input',
+    )
+    _TITLE_SELECTORS = (
+        'input[placeholder*="标题"]',
+        'input[name="title"]',
+        '.title-input',
+    )
+    
     def __init__(self, browser: XianyuBrowser):
         """
         初始化发布模块
@@ -145,6 +325,9 @@ class XianyuPublish:
         """
         self.browser = browser
         self._cookies_loaded = False
+        self._cookies_lock = asyncio.Lock()
+        self._resolved_locators: Dict[str, Any] = {}
+        self._publish_delay = _INITIAL_PUBLISH_DELAY
         logger.info("发布模块已初始化")
     
     async def publish(self, params: PublishParams) -> tuple[bool, str]:
@@ -157,7 +340,7 @@ class XianyuPublish:
         Returns:
             (是否成功，商品 ID 或错误信息)
         """
-        logger.info(f"开始发布商品：{params.title}")
+        logger.info("开始发布商品：{}", params.title)
         
         if not self.browser.page:
             return False, "浏览器未启动"
@@ -183,9 +366,7 @@ class XianyuPublish:
                 return False, result
             
         except Exception as e:
-            logger.error(f"发布过程出错：{e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"发布过程出错：{e}")
             return False, str(e)
 
     async def precheck_publish(self, params: PublishParams) -> Dict[str, Any]:
@@ -198,7 +379,7 @@ class XianyuPublish:
         Returns:
             预检查结果
         """
-        logger.info(f"预检查发布商品：{params.title}")
+        logger.info("预检查发布商品：{}", params.title)
 
         if not self.browser.page:
             return {
@@ -233,50 +414,50 @@ class XianyuPublish:
 
     async def _prepare_publish_form(self, params: PublishParams) -> None:
         """按当前网页结构填充发布表单。"""
+        self._resolved_locators.clear()
         await self._ensure_publish_page()
 
-        logger.info("上传图片...")
-        await self._upload_images(params.images)
+        logger.debug("上传图片...")
+        if params._abs_images:
+            await self._upload_images(params._abs_images, verified=True)
+        else:
+            await self._upload_images(params.images)
 
-        logger.info("填写标题...")
+        logger.debug("填写标题...")
         await self._fill_title(params.title)
 
-        logger.info("填写描述...")
+        logger.debug("填写描述...")
         await self._fill_description(params.generate_description(), title=params.title)
 
-        logger.info("填写价格...")
+        logger.debug("填写价格...")
         await self._fill_price(params.price)
 
         if params.category:
-            logger.info("选择分类...")
+            logger.debug("选择分类...")
             await self._select_category(params.category)
 
         if params.location:
-            logger.info("选择地区...")
+            logger.debug("选择地区...")
             await self._select_location(params.location)
 
-        logger.info("选择新旧程度...")
-        await self._select_condition(params.condition)
-
-        logger.info("选择配送方式...")
-        await self._select_delivery(params.delivery)
-
         if params.tags:
-            logger.info("添加标签...")
+            logger.debug("添加标签...")
             await self._add_tags(params.tags)
 
+        # 文本输入依赖键盘焦点必须串行；以下开关类控件只需点击且互不重叠，并发执行
+        logger.debug("选择新旧程度、配送方式...")
+        toggles = [
+            self._select_condition(params.condition),
+            self._select_delivery(params.delivery),
+        ]
         if params.is_original:
-            logger.info("声明原创...")
-            await self._mark_original()
+            logger.debug("声明原创...")
+            toggles.append(self._mark_original())
+        await asyncio.gather(*toggles)
 
     async def _inspect_publish_state(self) -> Dict[str, Any]:
         """检查当前发布表单是否可提交。"""
-        submit_button = await self._first_visible_locator([
-            "button.publish-button--KBpTVopQ",
-            "[class*='publish-button']",
-            'button[type="submit"]',
-            'button:has-text("发布")',
-        ])
+        submit_button = await self._resolve_locator("submit", self._SUBMIT_SELECTORS)
         button_class = await submit_button.get_attribute("class") if submit_button else ""
         button_text = (await submit_button.inner_text()).strip() if submit_button else ""
         blockers = await self._get_publish_blockers()
@@ -285,12 +466,12 @@ class XianyuPublish:
 
         message = "可提交" if ready_to_submit else "当前表单仍不可提交"
         if blockers:
-            message = "；".join(dict.fromkeys(blockers))
+            message = "；".join(blockers)
 
         return {
             "ready_to_submit": ready_to_submit,
             "message": message,
-            "blockers": list(dict.fromkeys(blockers)),
+            "blockers": blockers,
             "button_text": button_text,
             "button_enabled": ready_to_submit if submit_button else False,
             "web_publish_supported": not blocker_flags["requires_app"],
@@ -307,12 +488,17 @@ class XianyuPublish:
         if self._cookies_loaded:
             return
 
-        try:
-            login = XianyuLogin(self.browser)
-            self._cookies_loaded = await login.load_cookies()
-        except Exception as e:
-            logger.debug(f"加载 Cookie 失败：{e}")
-            self._cookies_loaded = False
+        # 并发调用时只允许一个协程加载 Cookie，其余等待后直接复用结果
+        async with self._cookies_lock:
+            if self._cookies_loaded:
+                return
+
+            try:
+                login = XianyuLogin(self.browser)
+                self._cookies_loaded = await login.load_cookies()
+            except Exception as e:
+                logger.debug(f"加载 Cookie 失败：{e}")
+                self._cookies_loaded = False
 
     async def _ensure_publish_page(self) -> None:
         """确保当前位于已登录的发布页。"""
@@ -323,7 +509,7 @@ class XianyuPublish:
 
         publish_url = "https://www.goofish.com/publish"
         if "/publish" not in self.browser.page.url:
-            logger.info(f"打开发布页面：{publish_url}")
+            logger.info("打开发布页面：{}", publish_url)
             await self.browser.page.goto(publish_url, wait_until="networkidle", timeout=30000)
             await self.browser.page.wait_for_timeout(3000)
 
@@ -334,13 +520,12 @@ class XianyuPublish:
 
         await self._ensure_cookies_loaded()
         edit_url = f"https://www.goofish.com/publish?itemId={item_id}"
-        logger.info(f"打开编辑页面：{edit_url}")
+        logger.info("打开编辑页面：{}", edit_url)
         await self.browser.page.goto(edit_url, wait_until="networkidle", timeout=30000)
         await self.browser.page.wait_for_timeout(3000)
+        self._resolved_locators.clear()
 
-        body_text = await self.browser.page.evaluate(
-            "() => document.body && document.body.innerText ? document.body.innerText : ''"
-        )
+        body_text = await self._get_body_text()
         if "商品不存在" in body_text or "宝贝不存在" in body_text:
             raise RuntimeError("未找到可编辑的商品")
 
@@ -351,7 +536,7 @@ class XianyuPublish:
 
         await self._ensure_cookies_loaded()
         item_url = f"https://www.goofish.com/item?id={item_id}"
-        logger.info(f"打开商品详情页：{item_url}")
+        logger.info("打开商品详情页：{}", item_url)
         await self.browser.page.goto(item_url, wait_until="networkidle", timeout=30000)
         await self.browser.page.wait_for_timeout(3000)
 
@@ -362,25 +547,79 @@ class XianyuPublish:
 
         await self._ensure_cookies_loaded()
         personal_url = "https://www.goofish.com/personal"
-        logger.info(f"打开个人主页：{personal_url}")
+        logger.info("打开个人主页：{}", personal_url)
         await self.browser.page.goto(personal_url, wait_until="networkidle", timeout=30000)
         await self.browser.page.wait_for_timeout(3000)
 
-    async def _first_visible_locator(self, selectors: List[str]):
+    async def _first_visible_locator(self, selectors: Sequence[str]):
         """返回第一个可见的定位器。"""
         if not self.browser.page:
             return None
 
-        for selector in selectors:
-            locator = self.browser.page.locator(selector)
-            count = await locator.count()
-            for index in range(count):
-                candidate = locator.nth(index)
-                try:
-                    if await candidate.is_visible():
-                        return candidate
-                except Exception:
-                    continue
+        # 一次 evaluate 在页面内完成 CSS 选择器的可见性探测；
+        # text= / :has-text() 等 Playwright 专有选择器仍按顺序逐个探测
+        start = 0
+        while start < len(selectors):
+            try:
+                hit = await self.browser.page.evaluate(
+                    _FIRST_VISIBLE_SCRIPT, {"selectors": list(selectors), "start": start}
+                )
+            except Exception as e:
+                logger.debug(f"批量探测可见元素失败，改为逐个探测：{e}")
+                break
+
+            if not hit:
+                return None
+
+            selector = selectors[hit["selector"]]
+            if hit["index"] is not None:
+                return self.browser.page.locator(selector).nth(hit["index"])
+
+            candidate = await self._probe_visible_locator(selector)
+            if candidate:
+                return candidate
+            start = hit["selector"] + 1
+
+        for selector in selectors[start:]:
+            candidate = await self._probe_visible_locator(selector)
+            if candidate:
+                return candidate
+
+        return None
+
+    async def _resolve_locator(self, key: str, selectors: Sequence[str]):
+        """
+        解析并缓存表单控件定位器，同一次表单填写内复用；未找到时不缓存。
+
+        缓存的是按下标取的 nth 定位器，表单重新渲染后下标可能失效，
+        因此复用前先确认仍可见，不可见时丢弃缓存重新查找。
+        """
+        locator = self._resolved_locators.get(key)
+        if locator is not None:
+            try:
+                visible = await locator.is_visible()
+            except Exception:
+                visible = False
+            if not visible:
+                del self._resolved_locators[key]
+                locator = None
+        if locator is None:
+            locator = await self._first_visible_locator(selectors)
+            if locator is not None:
+                self._resolved_locators[key] = locator
+        return locator
+
+    async def _probe_visible_locator(self, selector: str):
+        """用 Playwright 逐个探测单个选择器下的第一个可见元素。"""
+        locator = self.browser.page.locator(selector)
+        count = await locator.count()
+        for index in range(count):
+            candidate = locator.nth(index)
+            try:
+                if await candidate.is_visible():
+                    return candidate
+            except Exception:
+                continue
 
         return None
 
@@ -404,35 +643,42 @@ class XianyuPublish:
 
     def _sanitize_publish_text(self, text: str) -> str:
         """移除网页发布不支持的字符（如 emoji）。"""
-        # Goofish 网页发布会直接拦截 emoji，保守移除非 BMP 字符
-        return re.sub(r"[\U00010000-\U0010FFFF]", "", text)
+        return _EMOJI_RE.sub("", text)
 
     def _get_blocker_flags(self, blockers: List[str]) -> Dict[str, bool]:
         """把已知阻塞文案映射成结构化状态。"""
-        unique_blockers = set(blockers)
-        return {
-            "requires_app": "请使用闲鱼APP扫码继续发布" in unique_blockers,
-            "emoji_blocked": "商品描述不能包含emoji" in unique_blockers,
-            "category_unsupported": "网页版暂不支持发布此分类" in unique_blockers,
-        }
+        flags = dict.fromkeys(_BLOCKER_FLAG_MAP.values(), False)
+        for blocker in blockers:
+            flag = _BLOCKER_FLAG_MAP.get(blocker)
+            if flag:
+                flags[flag] = True
+        return flags
 
     async def _click_locator(self, locator, wait_ms: int = 800) -> bool:
         """尽量稳定地点击元素，依次尝试常规点击、强制点击和 JS 点击。"""
         if not locator:
             return False
 
-        click_attempts = (
-            {"timeout": 3000},
-            {"timeout": 3000, "force": True},
-        )
-        for kwargs in click_attempts:
+        try:
+            await locator.click(timeout=3000)
+            if self.browser.page:
+                await self.browser.page.wait_for_timeout(wait_ms)
+            return True
+        except PlaywrightTimeoutError as e:
+            # 元素被遮挡时强制点击通常能成功；
+            # 其余超时（不可见、未就绪）强制点击同样会超时，直接走 JS
+            retry_force = "intercepts pointer events" in str(e)
+        except Exception:
+            retry_force = True
+
+        if retry_force:
             try:
-                await locator.click(**kwargs)
+                await locator.click(timeout=3000, force=True)
                 if self.browser.page:
                     await self.browser.page.wait_for_timeout(wait_ms)
                 return True
             except Exception:
-                continue
+                pass
 
         try:
             await locator.evaluate("(node) => node.click()")
@@ -442,39 +688,63 @@ class XianyuPublish:
         except Exception:
             return False
 
-    async def _get_publish_blockers(self) -> List[str]:
-        """收集当前发布页的显式阻塞提示。"""
+    async def _wait_for_selector(self, selector: str, timeout: int) -> bool:
+        """等待元素出现，超时返回 False 而不抛错。"""
+        try:
+            await self.browser.page.wait_for_selector(selector, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _wait_for_confirm_dialog(
+        self, texts: Sequence[str], timeout: int
+    ) -> Optional[str]:
+        """等待任一确认弹窗文案出现，返回命中的文案；超时返回 None。"""
+        try:
+            handle = await self.browser.page.wait_for_function(
+                _CONFIRM_DIALOG_SCRIPT, arg=list(texts), timeout=timeout
+            )
+        except PlaywrightTimeoutError:
+            return None
+        return await handle.json_value()
+
+    async def _wait_for_confirm_dialog_closed(self, text: str, timeout: int) -> bool:
+        """等待指定确认弹窗文案消失，超时返回 False。"""
+        try:
+            await self.browser.page.wait_for_function(
+                f"(texts) => !({_CONFIRM_DIALOG_SCRIPT})(texts)", arg=[text], timeout=timeout
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _get_body_text(self) -> str:
+        """读取页面正文文本（innerText 会触发重排，每次检查只读一次）。"""
         if not self.browser.page:
-            return []
+            return ""
 
-        body_text = await self.browser.page.evaluate(
+        return await self.browser.page.evaluate(
             "() => document.body && document.body.innerText ? document.body.innerText : ''"
         )
-        blockers = []
 
-        known_messages = [
-            "商品描述不能包含emoji",
-            "网页版暂不支持发布此分类",
-            "请使用闲鱼APP扫码继续发布",
-        ]
-        for message in known_messages:
-            if message in body_text:
-                blockers.append(message)
+    async def _get_publish_blockers(self) -> List[str]:
+        """收集当前发布页的显式阻塞提示。"""
+        if not self.browser.page:
+            return []
+
+        body_text = await self._get_body_text()
+        if not body_text:
+            return []
 
-        return blockers
+        # 单次正则扫描正文，按出现顺序去重
+        return list(dict.fromkeys(_BLOCKER_RE.findall(body_text)))
 
     async def _read_current_description(self) -> str:
         """读取当前编辑器中的描述文本。"""
         if not self.browser.page:
             return ""
 
-        desc_input = await self._first_visible_locator([
-            "div[contenteditable='true']",
-            "[class*='editor']",
-            'textarea[placeholder*="描述"]',
-            'textarea[name="description"]',
-            '.description-input',
-        ])
+        desc_input = await self._resolve_locator("description", self._DESC_SELECTORS)
         if not desc_input:
             return ""
 
@@ -496,24 +766,20 @@ class XianyuPublish:
         if not self.browser.page:
             return None
 
-        containers = [
-            self.browser.page.locator("[class*='sellerButtonGroup']"),
-            self.browser.page.locator("[class*='buttons']"),
-            self.browser.page.locator("[class*='item-main-container']"),
-        ]
-        for container in containers:
-            try:
-                if not await container.count():
-                    continue
-                for label in labels:
-                    candidate = container.locator(f"text={label}")
-                    if await candidate.count():
-                        for index in range(await candidate.count()):
-                            button = candidate.nth(index)
-                            if await button.is_visible():
-                                return button
-            except Exception:
-                continue
+        # 一次 evaluate 遍历全部操作区并给命中元素打标记，再用属性选择器重新定位
+        try:
+            found = await self.browser.page.evaluate(
+                _ACTION_BUTTON_SCRIPT,
+                {
+                    "containers": list(_ACTION_CONTAINER_SELECTORS),
+                    "labels": list(labels),
+                    "marker": _ACTION_HIT_ATTR,
+                },
+            )
+            if found:
+                return self.browser.page.locator(f"[{_ACTION_HIT_ATTR}]").first
+        except Exception as e:
+            logger.debug(f"在操作区查找按钮失败：{e}")
 
         return await self._first_visible_text_locator(labels)
 
@@ -537,7 +803,7 @@ class XianyuPublish:
 
     def _extract_item_id(self, href: str) -> str:
         """从商品链接中提取商品 ID。"""
-        match = re.search(r"[?&]id=(\d+)", href or "")
+        match = _ITEM_ID_RE.search(href or "")
         return match.group(1) if match else ""
 
     def _parse_personal_item_card(self, raw_text: str, href: str) -> Dict[str, Any]:
@@ -597,8 +863,20 @@ class XianyuPublish:
             "can_delete": bool(item_id),
         }
     
-    async def _upload_images(self, image_paths: List[str]) -> None:
-        """上传图片"""
+    @staticmethod
+    def _resolve_image_file(image_path: str) -> str:
+        """返回存在的图片绝对路径，不存在时返回空字符串。"""
+        path = Path(image_path)
+        return str(path.absolute()) if path.exists() else ""
+
+    async def _upload_images(self, image_paths: List[str], verified: bool = False) -> None:
+        """
+        上传图片
+        
+        Args:
+            image_paths: 图片路径列表
+            verified: 路径是否已由 PublishParams.validate 校验并转为绝对路径
+        """
         if not self.browser.page:
             return
 
@@ -614,16 +892,30 @@ class XianyuPublish:
                 break
 
         if upload_input:
-            image_files = [str(Path(p).absolute()) for p in image_paths if Path(p).exists()]
+            if verified:
+                image_files = list(image_paths)
+            else:
+                # 图片可能位于挂载盘上，stat 放到线程池并发执行，避免阻塞事件循环
+                resolved = await asyncio.gather(
+                    *(asyncio.to_thread(self._resolve_image_file, p) for p in image_paths)
+                )
+                image_files = [path for path in resolved if path]
             if not image_files:
                 raise RuntimeError("没有可上传的图片文件")
 
+            image_count = await self.browser.page.evaluate("() => document.images.length")
             await upload_input.set_input_files(image_files)
-            logger.info(f"已上传 {len(image_files)} 张图片")
-            await self.browser.page.wait_for_timeout(2500)
+            logger.info("已上传 {} 张图片", len(image_files))
 
-            # 等待上传区发生变化，避免马上进入下一步
-            await self.browser.page.wait_for_timeout(1500)
+            # 等待预览图渲染出来再进入下一步，最长等待原先的固定间隔
+            try:
+                await self.browser.page.wait_for_function(
+                    "([before, added]) => document.images.length >= before + added",
+                    arg=[image_count, len(image_files)],
+                    timeout=4000,
+                )
+            except PlaywrightTimeoutError:
+                logger.debug("等待图片预览超时，继续填写表单")
             return
 
         raise RuntimeError("未找到图片上传控件")
@@ -633,11 +925,7 @@ class XianyuPublish:
         if not self.browser.page:
             return
 
-        title_input = await self._first_visible_locator([
-            'input[placeholder*="标题"]',
-            'input[name="title"]',
-            '.title-input',
-        ])
+        title_input = await self._resolve_locator("title", self._TITLE_SELECTORS)
 
         if title_input:
             await title_input.fill(title)
@@ -655,13 +943,7 @@ class XianyuPublish:
         if title and title not in final_text:
             final_text = self._sanitize_publish_text(f"{title}\n{final_text}".strip())
 
-        desc_input = await self._first_visible_locator([
-            "div[contenteditable='true']",
-            "[class*='editor']",
-            'textarea[placeholder*="描述"]',
-            'textarea[name="description"]',
-            '.description-input',
-        ])
+        desc_input = await self._resolve_locator("description", self._DESC_SELECTORS)
 
         if not desc_input:
             raise RuntimeError("未找到描述输入区域")
@@ -673,32 +955,20 @@ class XianyuPublish:
             await self.browser.page.keyboard.type(final_text)
         else:
             await desc_input.fill(final_text)
-
-        await self.browser.page.wait_for_timeout(500)
     
     async def _fill_price(self, price: float) -> None:
         """填写价格"""
         if not self.browser.page:
             return
 
-        price_inputs = self.browser.page.locator("input.ant-input")
-        count = await price_inputs.count()
-        for index in range(count):
-            item = price_inputs.nth(index)
-            try:
-                if not await item.is_visible():
-                    continue
-                placeholder = await item.get_attribute("placeholder") or ""
-                if placeholder != "0.00":
-                    continue
-                await item.fill("")
-                await item.type(f"{price:.2f}".rstrip("0").rstrip("."))
-                await self.browser.page.wait_for_timeout(300)
-                return
-            except Exception:
-                continue
+        # 在页面内一次找出可见且 placeholder 为 0.00 的价格输入框
+        index = await self.browser.page.evaluate(_PRICE_INPUT_SCRIPT)
+        if index is None or index < 0:
+            raise RuntimeError("未找到价格输入框")
 
-        raise RuntimeError("未找到价格输入框")
+        item = self.browser.page.locator("input.ant-input").nth(index)
+        await item.fill("")
+        await item.type(f"{price:.2f}".rstrip("0").rstrip("."))
     
     async def _select_category(self, category: str) -> None:
         """选择分类"""
@@ -706,7 +976,7 @@ class XianyuPublish:
             return
 
         # 当前页面由描述和图片智能识别属性，暂不强制失败
-        logger.debug(f"当前发布页未发现稳定分类入口，跳过手动分类：{category}")
+        logger.debug("当前发布页未发现稳定分类入口，跳过手动分类：{}", category)
     
     async def _select_location(self, location: str) -> None:
         """选择地区"""
@@ -722,9 +992,12 @@ class XianyuPublish:
             logger.debug("未找到地址选择入口，跳过地区设置")
             return
 
-        if not await self._click_locator(trigger, wait_ms=1000):
+        if not await self._click_locator(trigger, wait_ms=0):
             logger.debug("点击地址选择入口失败，跳过地区设置")
             return
+        await self._wait_for_selector(
+            "input[placeholder*='搜索'], [class*='addressItem']", timeout=1000
+        )
 
         search_input = await self._first_visible_locator([
             "input[placeholder*='搜索地点']",
@@ -733,7 +1006,7 @@ class XianyuPublish:
         if search_input and location:
             try:
                 await search_input.fill(location)
-                await self.browser.page.wait_for_timeout(1000)
+                await self._wait_for_selector(".auto-item", timeout=1000)
 
                 suggestions = self.browser.page.locator(".auto-item")
                 suggestion_count = await suggestions.count()
@@ -782,21 +1055,14 @@ class XianyuPublish:
                     return
                 except Exception:
                     pass
-        logger.debug(f"当前发布页未发现稳定新旧程度入口，跳过：{condition}")
+        logger.debug("当前发布页未发现稳定新旧程度入口，跳过：{}", condition)
     
     async def _select_delivery(self, delivery: str) -> None:
         """选择配送方式"""
         if not self.browser.page:
             return
 
-        normalized = delivery.strip()
-        mapping = {
-            "包邮": "包邮",
-            "按距离计费": "按距离计费",
-            "一口价": "一口价",
-            "无需邮寄": "无需邮寄",
-        }
-        target_text = mapping.get(normalized, "包邮")
+        target_text = _DELIVERY_MAP.get(delivery.strip(), "包邮")
 
         radio = self.browser.page.locator(".ant-radio-wrapper").filter(has_text=target_text)
         if await radio.count():
@@ -804,7 +1070,7 @@ class XianyuPublish:
             await self.browser.page.wait_for_timeout(500)
             return
 
-        logger.debug(f"未找到配送方式选项，保持默认：{target_text}")
+        logger.debug("未找到配送方式选项，保持默认：{}", target_text)
     
     async def _add_tags(self, tags: List[str]) -> None:
         """添加标签"""
@@ -812,7 +1078,7 @@ class XianyuPublish:
             return
 
         # 当前发布页无稳定标签入口，先记录跳过
-        logger.debug(f"当前发布页未发现稳定标签入口，跳过：{tags}")
+        logger.debug("当前发布页未发现稳定标签入口，跳过：{}", tags)
     
     async def _mark_original(self) -> None:
         """声明原创"""
@@ -847,12 +1113,7 @@ class XianyuPublish:
         
         try:
             # 找到发布按钮
-            submit_button = await self._first_visible_locator([
-                "button.publish-button--KBpTVopQ",
-                "[class*='publish-button']",
-                'button[type="submit"]',
-                'button:has-text("发布")',
-            ])
+            submit_button = await self._resolve_locator("submit", self._SUBMIT_SELECTORS)
 
             if not submit_button:
                 return False, "未找到发布按钮"
@@ -869,7 +1130,7 @@ class XianyuPublish:
             await self.browser.page.wait_for_timeout(3000)
 
             current_url = self.browser.page.url
-            match = re.search(r"[?&]id=(\d+)", current_url)
+            match = _ITEM_ID_RE.search(current_url)
             if match and "/item" in current_url:
                 return True, match.group(1)
 
@@ -911,7 +1172,7 @@ class XianyuPublish:
         Returns:
             (是否成功，消息)
         """
-        logger.info(f"编辑商品 {item_id}")
+        logger.info("编辑商品 {}", item_id)
         if not self.browser.page:
             return False, "浏览器未启动"
 
@@ -928,7 +1189,7 @@ class XianyuPublish:
             pending_title = updates.get("title")
 
             if updates.get("images"):
-                logger.info("更新图片...")
+                logger.debug("更新图片...")
                 await self._upload_images(updates["images"])
 
             if pending_title and not pending_description:
@@ -936,34 +1197,34 @@ class XianyuPublish:
                 pending_description = current_description or pending_title
 
             if pending_description is not None:
-                logger.info("更新描述...")
+                logger.debug("更新描述...")
                 await self._fill_description(str(pending_description), title=str(pending_title or ""))
             elif pending_title:
-                logger.info("更新标题...")
+                logger.debug("更新标题...")
                 await self._fill_title(str(pending_title))
 
             if "price" in updates and updates["price"] is not None:
-                logger.info("更新价格...")
+                logger.debug("更新价格...")
                 await self._fill_price(float(updates["price"]))
 
             if updates.get("location"):
-                logger.info("更新地区...")
+                logger.debug("更新地区...")
                 await self._select_location(str(updates["location"]))
 
             if updates.get("condition"):
-                logger.info("更新新旧程度...")
+                logger.debug("更新新旧程度...")
                 await self._select_condition(str(updates["condition"]))
 
             if updates.get("delivery"):
-                logger.info("更新配送方式...")
+                logger.debug("更新配送方式...")
                 await self._select_delivery(str(updates["delivery"]))
 
             if "tags" in updates and updates.get("tags"):
-                logger.info("更新标签...")
+                logger.debug("更新标签...")
                 await self._add_tags(list(updates["tags"]))
 
             if updates.get("is_original"):
-                logger.info("更新原创声明...")
+                logger.debug("更新原创声明...")
                 await self._mark_original()
 
             if dry_run:
@@ -999,7 +1260,7 @@ class XianyuPublish:
         Returns:
             (是否成功，消息)
         """
-        logger.info(f"下架商品 {item_id}")
+        logger.info("下架商品 {}", item_id)
         if not self.browser.page:
             return False, "浏览器未启动"
 
@@ -1021,13 +1282,12 @@ class XianyuPublish:
                     return False, "当前商品未找到“下架”按钮，可能已下架；如需彻底删除请设置 force_delete=True"
                 return False, "未找到可用的下架按钮"
 
-            if not await self._click_locator(action_button, wait_ms=1000):
+            if not await self._click_locator(action_button, wait_ms=0):
                 return False, f"点击“{action_name}”按钮失败"
 
-            body_text = await self.browser.page.evaluate(
-                "() => document.body && document.body.innerText ? document.body.innerText : ''"
-            )
-            if "确定要下架这个宝贝吗" in body_text or "确定要删除这个宝贝吗" in body_text:
+            if await self._wait_for_confirm_dialog(
+                _CONFIRM_DIALOG_TEXTS, timeout=_CONFIRM_DIALOG_PROBE_MS
+            ):
                 if dry_run:
                     cancel_button = await self._first_visible_text_locator(["取消"])
                     if cancel_button:
@@ -1038,20 +1298,12 @@ class XianyuPublish:
             elif dry_run:
                 return True, f"已定位“{action_name}”按钮"
 
-            await self.browser.page.wait_for_timeout(3000)
-
-            refreshed_text = await self.browser.page.evaluate(
-                "() => document.body && document.body.innerText ? document.body.innerText : ''"
-            )
-
-            if action_name == "下架":
-                if "确定要下架这个宝贝吗" in refreshed_text:
-                    return False, "下架确认后页面仍停留在确认弹窗，可能未执行成功"
-                return True, "商品已下架"
-
-            if "确定要删除这个宝贝吗" in refreshed_text:
-                return False, "删除确认后页面仍停留在确认弹窗，可能未执行成功"
-            return True, "商品已删除"
+            # 确认后等待对应弹窗关闭，通常不到一秒
+            if not await self._wait_for_confirm_dialog_closed(
+                f"确定要{action_name}这个宝贝吗", timeout=5000
+            ):
+                return False, f"{action_name}确认后页面仍停留在确认弹窗，可能未执行成功"
+            return True, f"商品已{action_name}"
         except Exception as e:
             logger.error(f"下架商品失败：{e}")
             return False, str(e)
@@ -1088,26 +1340,75 @@ class XianyuPublish:
 
         return items
     
-    async def batch_publish(self, items: List[PublishParams]) -> List[tuple[bool, str]]:
+    def _update_publish_delay(self, success: bool, result: str) -> None:
+        """根据上一次发布结果调整批量发布间隔：疑似限流时加倍，正常成功时逐步回落。"""
+        if any(marker in (result or "") for marker in _THROTTLE_MARKERS):
+            self._publish_delay = min(self._publish_delay * 2, _MAX_PUBLISH_DELAY)
+            logger.warning("疑似触发限流，发布间隔调整为 {:.1f} 秒", self._publish_delay)
+        elif success:
+            self._publish_delay = max(self._publish_delay * 0.8, _MIN_PUBLISH_DELAY)
+
+    async def batch_publish(
+        self,
+        items: List[PublishParams],
+        max_concurrency: int = 3,
+    ) -> List[tuple[bool, str]]:
         """
         批量发布
         
         Args:
             items: 商品列表
+            max_concurrency: 最大并发发布数（每个并发占用一个标签页）
             
         Returns:
-            发布结果列表
+            发布结果列表（与 items 顺序一致）
         """
-        logger.info(f"批量发布 {len(items)} 个商品")
-        
-        results = []
-        for i, item in enumerate(items):
-            logger.info(f"发布第 {i+1}/{len(items)} 个商品")
-            success, result = await self.publish(item)
-            results.append((success, result))
-            
-            # 间隔等待，避免触发风控
-            if i < len(items) - 1:
-                await self.browser.page.wait_for_timeout(30000)  # 30 秒间隔
-        
-        return results
+        logger.info("批量发布 {} 个商品，并发数：{}", len(items), max_concurrency)
+        if not items:
+            return []
+        if not self.browser.page:
+            return [(False, "浏览器未启动")] * len(items)
+
+        # 标签页共享同一上下文的 Cookie，只需加载一次
+        await self._ensure_cookies_loaded()
+
+        # 发布间隔在借用标签页之前等待，等待期间不占用页面；
+        # 等待用锁串行化，相邻两次发布的开始时间至少相隔一个间隔
+        pacing = asyncio.Lock()
+
+        async def publish_one(index: int, item: PublishParams) -> tuple[bool, str]:
+            if index > 0:
+                async with pacing:
+                    # 自适应间隔加随机抖动，避免固定节奏触发风控
+                    await asyncio.sleep(self._publish_delay + _RNG.uniform(0, 2))
+            async with pool.acquire() as tab:
+                logger.info("发布第 {}/{} 个商品", index + 1, len(items))
+                publisher = self
+                if tab is not self.browser:
+                    publisher = XianyuPublish(tab)
+                    publisher._cookies_loaded = self._cookies_loaded
+                success, result = await publisher.publish(item)
+                self._update_publish_delay(success, result)
+                return success, result
+
+        pool = BrowserPool(self.browser, min(max_concurrency, len(items)))
+        try:
+            await pool.open()
+        except Exception as e:
+            # 新建标签页失败时退回只用当前页面逐个发布，不让整批直接失败
+            logger.warning("创建页面池失败，改为单页面发布：{}", e)
+            pool = BrowserPool(self.browser, 1)
+            await pool.open()
+
+        try:
+            results = await asyncio.gather(
+                *(publish_one(index, item) for index, item in enumerate(items)),
+                return_exceptions=True,
+            )
+        finally:
+            await pool.close()
+
+        return [
+            (False, str(result)) if isinstance(result, BaseException) else result
+            for result in results
+        ]
@@ -4,18 +4,296 @@
 实现闲鱼商品搜索、筛选、竞品监控等功能
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
 from urllib.parse import urlencode
+import asyncio
+import functools
+import operator
+import re
 from loguru import logger
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .browser import XianyuBrowser
 
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖，未安装时回退到逐个关键词匹配
+    ahocorasick = None
 
-@dataclass
+
+# 竞品详情并发获取上限
+_COMPETITOR_CONCURRENCY = 8
+
+# 搜索重试的指数退避上限（秒）
+_MAX_RETRY_BACKOFF = 8
+
+# 单次搜索（含重试）的默认总时限，以及超时后解析已加载结果的时限（秒）
+_SEARCH_DEADLINE = 30.0
+_PARTIAL_PARSE_TIMEOUT = 5.0
+
+# 单次搜索尝试各步骤的超时上限（毫秒）：导航、等待结果、网络空闲兜底、结果/空结果探测。
+# 实际超时取该上限与总时限剩余时间的较小值，时间将尽时各步骤随之缩短
+_NAV_TIMEOUT_MS = 15000
+_RESULT_WAIT_MS = 8000
+_NETWORKIDLE_WAIT_MS = 10000
+_HAS_RESULTS_WAIT_MS = 5000
+
+# 过滤关键词达到该数量时改用 Aho-Corasick 自动机一次扫描标题
+_AUTOMATON_MIN_KEYWORDS = 4
+
+# 搜索结果链接（用于判断结果是否已加载）
+_RESULT_SELECTOR = (
+    ".feeds-list-container--UkIMBPNk a[href*='/item?id='], "
+    "[class*='feeds-list-container'] a[href*='/item?id='], "
+    "a[href*='/item?id=']"
+)
+_NO_RESULT_SELECTOR = ".no-result, .empty-state"
+
+# 优先锁定真实商品流容器，避免抓到搜索建议和 SEO 隐藏链接
+_CONTAINER_SELECTORS = (
+    ".feeds-list-container--UkIMBPNk",
+    "[class*='feeds-list-container']",
+    "[class*='search-result']",
+    "[class*='search-list']",
+    "[class*='goods-list']",
+    "[class*='item-list']",
+)
+
+# 商品卡片选择器（在容器内查找）
+_CARD_SELECTORS = (
+    "a[href*='/item?id=']",
+    "a[class*='feeds-item-wrap']",
+    "[class*='feeds-item-wrap']",
+    "[class*='card-container']",
+    "[class*='goods-item']",
+    "[class*='item-card']",
+)
+
+# 找不到卡片时的全页兜底，但仍然只接受商品详情链接
+_FALLBACK_CARD_SELECTOR = "a[href*='/item?id='], a[href*='/detail/'], a[href*='/goods/']"
+
+# 商品详情链接特征
+_ITEM_LINK_MARKERS = ("/detail/", "/item?id=", "/goods/")
+
+# 排序方式到 URL 参数的映射
+_SORT_MAP = {
+    "default": None,
+    "price_asc": "priceAsc",
+    "price_desc": "priceDesc",
+    "sales": "sales",
+}
+
+# 商品卡片解析用正则
+_PRICE_RE = re.compile(r'[￥¥]?([\d.]+)')
+_NUM_RE = re.compile(r'([\d.]+)')
+_ID_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (r'/detail/(\w+)', r'[?&]id=(\w+)', r'/goods/(\w+)', r'id=(\w+)')
+)
+_TOKEN_RE = re.compile(r'xsec_token=([^&]+)')
+
+# 商品卡片各字段的候选选择器（按优先级排列）
+_CARD_FIELD_SELECTORS: Dict[str, List[str]] = {
+    "title": [
+        "[class*='main-title']",
+        "[class*='row1-wrap-title']",
+        "[class*='title']",
+        "[class*='name']",
+        "h3",
+        "h4",
+        "div[class*='card'] div:first-child",
+    ],
+    "price": [
+        "[class*='price-wrap']",
+        "[class*='price']",
+        "span[class*='money']",
+        "[class*='money']",
+        "div[class*='price']",
+    ],
+    "seller": [
+        "[class*='seller']",
+        "[class*='user']",
+        "[class*='nick']",
+        "div[class*='user-info']",
+    ],
+    "location": [
+        "[class*='seller-text']",
+        "[class*='location']",
+        "[class*='area']",
+        "[class*='city']",
+        "div[class*='region']",
+    ],
+    "want": [
+        "[class*='price-desc']",
+        "[class*='want']",
+        "[class*='like']",
+        "[class*='collect']",
+        "span[class*='count']",
+    ],
+    "category": ["[class*='category'], [class*='tag']"],
+    "desc": ["[class*='desc'], [class*='subtitle']"],
+    "condition": ["[class*='condition'], [class*='new']"],
+}
+
+# 一次往返取回卡片全部原始字段，正则解析留在 Python 侧完成。
+# "tag[class*='x']" 形式（含逗号并列）的选择器改为一次遍历卡片内所有带 class 的
+# 节点、按类名子串归类，每条规则记录文档顺序中的首个命中；其余选择器
+# （如 h3）仍按需 querySelector。字段取值顺序与逐个选择器探测一致：
+# 单值字段取首个命中规则的文本（未命中为 null）；价格和想要人数返回每个
+# 命中规则的文本，由 Python 依次尝试解析。
+_CARD_FIELDS_SCRIPT = """
+(el, fields) => {
+    const CLASS_RULE = /^([a-z0-9]*)\\[class\\*='([^']+)'\\]$/;
+    const compile = (sel) => {
+        const parts = sel.split(',').map((part) => part.trim().match(CLASS_RULE));
+        if (!parts.every(Boolean)) return null;
+        return parts.map((m) => ({tag: m[1].toUpperCase(), sub: m[2]}));
+    };
+    const specs = {};
+    for (const [field, sels] of Object.entries(fields)) {
+        specs[field] = sels.map((sel) => ({sel, alts: compile(sel), node: null}));
+    }
+
+    const classRules = Object.values(specs).flat().filter((rule) => rule.alts);
+    let pending = classRules.length;
+    for (const node of el.querySelectorAll('[class]')) {
+        if (!pending) break;
+        const cls = node.getAttribute('class') || '';
+        for (const rule of classRules) {
+            if (rule.node) continue;
+            if (rule.alts.some((a) => (!a.tag || node.tagName === a.tag) && cls.includes(a.sub))) {
+                rule.node = node;
+                pending--;
+            }
+        }
+    }
+
+    const resolve = (rule) => (rule.alts ? rule.node : el.querySelector(rule.sel));
+    const pick = (field) => {
+        for (const rule of specs[field]) {
+            const node = resolve(rule);
+            if (node) return (node.innerText || '').trim();
+        }
+        return null;
+    };
+    const pickAll = (field) => specs[field]
+        .map(resolve)
+        .filter(Boolean)
+        .map((node) => node.innerText || '');
+    const img = el.querySelector('img');
+    const link = el.tagName === 'A' ? el : el.querySelector('a[href]');
+    return {
+        title: pick('title'),
+        titleAttr: el.getAttribute('title') || '',
+        text: el.innerText || '',
+        prices: pickAll('price'),
+        images: img
+            ? ['src', 'data-src', 'original-src'].map((a) => img.getAttribute(a) || '')
+            : [],
+        seller: pick('seller'),
+        location: pick('location'),
+        wants: pickAll('want'),
+        href: link ? (link.getAttribute('href') || '') : '',
+        category: pick('category'),
+        desc: pick('desc'),
+        condition: pick('condition'),
+    };
+}
+"""
+
+# 一次往返完成容器定位 → 卡片查找 → 可见性过滤 → 字段提取。
+# 非法选择器按未命中处理；单张卡片提取出错时跳过该卡片。
+_SEARCH_RESULTS_SCRIPT = """
+({containerSelectors, cardSelectors, fallbackSelector, fields, limit}) => {
+    const extract = """ + _CARD_FIELDS_SCRIPT + """;
+    const query = (root, sel) => {
+        try {
+            return root.querySelectorAll(sel);
+        } catch (e) {
+            return [];
+        }
+    };
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    let container = null;
+    let containerSelector = null;
+    for (const s of containerSelectors) {
+        const found = query(document, s);
+        if (found.length) {
+            container = found[0];
+            containerSelector = s;
+            break;
+        }
+    }
+
+    let cards = [];
+    let cardSelector = null;
+    for (const s of cardSelectors) {
+        const found = query(container || document, s);
+        if (found.length) {
+            cards = Array.from(found);
+            cardSelector = s;
+            break;
+        }
+    }
+    if (!cards.length) {
+        cards = Array.from(query(document, fallbackSelector));
+    }
+
+    // 先过滤不可见卡片再截取，隐藏卡片不占用 limit 名额
+    const items = [];
+    for (const card of cards.filter(isVisible).slice(0, limit)) {
+        try {
+            items.push(extract(card, fields));
+        } catch (e) {
+            // 单张卡片失败不影响其余卡片
+        }
+    }
+    return {containerSelector, cardSelector, total: cards.length, items};
+}
+"""
+
+
+def _prefer_first(preferred: Optional[str], selectors: Sequence[str]) -> List[str]:
+    """把上次命中的选择器提到最前，其余保持原有优先级"""
+    if not preferred or preferred not in selectors:
+        return list(selectors)
+    return [preferred] + [s for s in selectors if s != preferred]
+
+
+@functools.lru_cache(maxsize=32)
+def _keyword_automaton(keywords: frozenset):
+    """按（小写）关键词集合构建并缓存自动机，相同过滤条件的重复搜索无需重建"""
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_href(href: str) -> tuple[str, str]:
+    """从商品链接中提取 (商品 ID, xsec_token)，相同链接直接命中缓存"""
+    item_id = ""
+    for pattern in _ID_PATTERNS:
+        match = pattern.search(href)
+        if match:
+            item_id = match.group(1)
+            break
+    
+    token_match = _TOKEN_RE.search(href)
+    return item_id, token_match.group(1) if token_match else ""
+
+
+@dataclass(slots=True)
 class XianyuItem:
-    """商品数据结构"""
+    """商品数据结构（使用 __slots__，搜索结果量大时节省内存）"""
     id: str = ""
     title: str = ""
     price: float = 0.0
@@ -32,20 +310,31 @@ class XianyuItem:
     condition: str = ""  # 新旧程度
     category: str = ""
     publish_time: Optional[datetime] = None
-    extra_data: Dict[str, Any] = field(default_factory=dict)
+    extra_data: Optional[Dict[str, Any]] = None  # 按需创建，见 add_extra
+    
+    def add_extra(self, key: str, value: Any) -> None:
+        """写入附加数据，首次写入时才创建字典"""
+        if self.extra_data is None:
+            self.extra_data = {}
+        self.extra_data[key] = value
+    
+    # to_dict 输出的字段（顺序即输出顺序）；未加注解，不会被 dataclass 当作字段。
+    # attrgetter 一次 C 调用取齐所有属性
+    _DICT_FIELDS = (
+        "id",
+        "title",
+        "price",
+        "location",
+        "seller_name",
+        "url",
+        "image_url",
+        "want_count",
+    )
+    _get_dict_values = operator.attrgetter(*_DICT_FIELDS)
     
     def to_dict(self) -> dict:
         """转换为字典"""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "price": self.price,
-            "location": self.location,
-            "seller_name": self.seller_name,
-            "url": self.url,
-            "image_url": self.image_url,
-            "want_count": self.want_count,
-        }
+        return dict(zip(self._DICT_FIELDS, self._get_dict_values(self)))
 
 
 class XianyuSearch:
@@ -59,6 +348,9 @@ class XianyuSearch:
             browser: 浏览器实例
         """
         self.browser = browser
+        # 上次命中的容器 / 卡片选择器，页面结构稳定时下次优先尝试
+        self._cached_container_sel: Optional[str] = None
+        self._cached_card_sel: Optional[str] = None
         logger.info("搜索模块已初始化")
     
     async def search(
@@ -71,7 +363,8 @@ class XianyuSearch:
         limit: int = 20,
         retry_count: int = 3,
         filter_keywords: Optional[List[str]] = None,
-        exact_match: bool = False
+        exact_match: bool = False,
+        deadline: float = _SEARCH_DEADLINE
     ) -> List[XianyuItem]:
         """
         搜索商品（增强版 - 带关键词过滤和精确匹配）
@@ -86,6 +379,7 @@ class XianyuSearch:
             retry_count: 失败重试次数
             filter_keywords: 过滤关键词（标题必须包含这些词）
             exact_match: 是否精确匹配关键词
+            deadline: 整个搜索（含重试）的总时限（秒），超时返回当前页面已加载的结果
             
         Returns:
             商品列表
@@ -100,8 +394,53 @@ class XianyuSearch:
             logger.error("关键词长度必须在 1-50 个字符之间")
             return []
         
+        # 各步骤自身的超时叠加后可能远超预期，整体再套一个总时限；
+        # 剩余时间同时传给各步骤，让等待和退避随之缩短
+        deadline_at = asyncio.get_running_loop().time() + deadline
+        try:
+            return await asyncio.wait_for(
+                self._search_with_retry(
+                    keyword, price_min, price_max, location, sort_by,
+                    limit, retry_count, filter_keywords, exact_match, deadline_at,
+                ),
+                timeout=deadline,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"搜索超过总时限 {deadline}s，返回当前页面已加载的结果")
+        
+        try:
+            items = await asyncio.wait_for(
+                self._parse_search_results(limit), timeout=_PARTIAL_PARSE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return []
+        if filter_keywords or exact_match:
+            items = self._filter_items(items, keyword, filter_keywords, exact_match)
+        return items
+    
+    async def _search_with_retry(
+        self,
+        keyword: str,
+        price_min: Optional[float],
+        price_max: Optional[float],
+        location: Optional[str],
+        sort_by: str,
+        limit: int,
+        retry_count: int,
+        filter_keywords: Optional[List[str]],
+        exact_match: bool,
+        deadline_at: float,
+    ) -> List[XianyuItem]:
+        """
+        按 search 的参数打开搜索页并解析结果，失败时按指数退避重试
+        
+        deadline_at 为事件循环时钟上的截止时刻；各步骤超时和退避不超过剩余时间，
+        时间用尽时抛出 asyncio.TimeoutError，由 search 返回已加载的结果。
+        """
         # 重试机制
         for attempt in range(retry_count):
+            if self._remaining(deadline_at) <= 0:
+                raise asyncio.TimeoutError
             try:
                 logger.debug(f"搜索尝试 {attempt + 1}/{retry_count}")
                 
@@ -122,13 +461,7 @@ class XianyuSearch:
                     query_params["location"] = location
                 
                 # 添加排序
-                sort_map = {
-                    "default": None,
-                    "price_asc": "priceAsc",
-                    "price_desc": "priceDesc",
-                    "sales": "sales",
-                }
-                sort_value = sort_map.get(sort_by)
+                sort_value = _SORT_MAP.get(sort_by)
                 if sort_value:
                     query_params["sort"] = sort_value
                 
@@ -136,33 +469,45 @@ class XianyuSearch:
                 search_url = f"{base_url}?{urlencode(query_params)}"
                 logger.info(f"搜索 URL: {search_url}")
                 
-                # 访问页面（带重试）
+                # 访问页面：DOM 就绪即可，闲鱼的埋点长轮询会让 networkidle 迟迟不触发
                 try:
-                    await self.browser.page.goto(search_url, wait_until="networkidle", timeout=30000)
+                    await self.browser.page.goto(
+                        search_url,
+                        wait_until="domcontentloaded",
+                        timeout=self._step_timeout(deadline_at, _NAV_TIMEOUT_MS),
+                    )
                 except Exception as nav_error:
                     logger.warning(f"导航失败：{nav_error}，尝试等待页面加载")
-                    await self.browser.page.wait_for_timeout(5000)
-                
-                # 等待内容加载（更长时间）
-                await self.browser.page.wait_for_timeout(5000 + (attempt * 2000))
                 
-                # 尝试等待搜索结果出现
+                # 等待搜索结果出现即继续，不再固定睡眠
                 try:
                     await self.browser.page.wait_for_selector(
-                        ".feeds-list-container--UkIMBPNk a[href*='/item?id='], [class*='feeds-list-container'] a[href*='/item?id='], a[href*='/item?id=']",
-                        timeout=10000
+                        _RESULT_SELECTOR,
+                        state="visible",
+                        timeout=self._step_timeout(deadline_at, _RESULT_WAIT_MS),
                     )
                     logger.debug("搜索结果已加载")
-                except:
+                    has_results = True
+                except PlaywrightTimeoutError:
                     logger.warning("等待搜索结果超时，继续解析")
+                    # 兜底：结果迟迟不出现时再等一次网络空闲
+                    try:
+                        await self.browser.page.wait_for_load_state(
+                            "networkidle",
+                            timeout=self._step_timeout(deadline_at, _NETWORKIDLE_WAIT_MS),
+                        )
+                    except PlaywrightTimeoutError:
+                        logger.debug("等待网络空闲超时")
+                    # 检查是否有搜索结果
+                    has_results = await self._check_has_results(
+                        self._step_timeout(deadline_at, _HAS_RESULTS_WAIT_MS)
+                    )
                 
-                # 检查是否有搜索结果
-                has_results = await self._check_has_results()
                 if not has_results:
                     logger.warning(f"未找到搜索结果，尝试重试 {attempt + 1}/{retry_count}")
                     if attempt < retry_count - 1:
-                        await self.browser.page.reload(wait_until="networkidle")
-                        await self.browser.page.wait_for_timeout(3000)
+                        # 下一轮会重新打开搜索页，这里只做退避
+                        await asyncio.sleep(self._backoff(attempt, deadline_at))
                         continue
                 
                 # 解析搜索结果
@@ -184,12 +529,12 @@ class XianyuSearch:
             except Exception as e:
                 logger.error(f"搜索失败 (尝试 {attempt + 1}/{retry_count}): {e}")
                 if attempt < retry_count - 1:
-                    wait_time = (attempt + 1) * 2000
-                    logger.info(f"等待 {wait_time}ms 后重试...")
-                    await self.browser.page.wait_for_timeout(wait_time)
+                    wait_time = self._backoff(attempt, deadline_at)
+                    logger.info(f"等待 {wait_time}s 后重试...")
+                    await asyncio.sleep(wait_time)
                 else:
-                    import traceback
-                    traceback.print_exc()
+                    # 堆栈只在 debug 级别输出，未启用时 loguru 不会格式化异常
+                    logger.opt(exception=True).debug("搜索失败堆栈")
                     return []
         
         return []
@@ -213,74 +558,85 @@ class XianyuSearch:
         Returns:
             过滤后的商品列表
         """
-        filtered = []
-        
         # 中文不需要转小写，直接使用原关键词
         # 但为了兼容性，同时准备小写版本（用于英文）
-        keyword_check = keyword.lower()
-        filter_keywords_check = [kw.lower() for kw in filter_keywords] if filter_keywords else []
+        # 标题只转换一次小写，后续各模式共用
+        titles = [(item, item.title, item.title.lower()) for item in items if item.title]
         
-        for item in items:
-            if not item.title:
-                continue
-            
-            # 标题也准备两个版本
-            title_check = item.title.lower()
-            title_original = item.title
-            
-            # 精确匹配模式
-            if exact_match:
-                # 检查原始标题或小写标题是否包含关键词
-                if keyword in title_original or keyword_check in title_check:
-                    filtered.append(item)
-                continue
-            
-            # 过滤关键词模式
-            if filter_keywords:
-                # 标题必须包含至少一个过滤关键词（更宽松）
-                match = False
-                for kw in filter_keywords:
-                    if kw in title_original or kw.lower() in title_check:
-                        match = True
-                        break
-                if match:
-                    filtered.append(item)
-                continue
-            
-            # 默认模式：包含主关键词即可
-            if keyword in title_original or keyword_check in title_check:
-                filtered.append(item)
+        # 过滤关键词模式：标题必须包含至少一个过滤关键词（更宽松）
+        # 精确匹配优先于过滤关键词
+        if filter_keywords and not exact_match:
+            keywords_lower = frozenset(kw.lower() for kw in filter_keywords)
+            if (
+                ahocorasick is not None
+                and len(keywords_lower) >= _AUTOMATON_MIN_KEYWORDS
+                and "" not in keywords_lower
+            ):
+                automaton = _keyword_automaton(keywords_lower)
+                return [
+                    item for item, _, title_lower in titles
+                    if next(automaton.iter(title_lower), None) is not None
+                ]
+            
+            keywords = [(kw, kw.lower()) for kw in filter_keywords]
+            return [
+                item for item, title, title_lower in titles
+                if any(kw in title or kw_lower in title_lower for kw, kw_lower in keywords)
+            ]
         
-        return filtered
+        # 精确匹配模式 / 默认模式：检查原始标题或小写标题是否包含主关键词
+        keyword_check = keyword.lower()
+        return [
+            item for item, title, title_lower in titles
+            if keyword in title or keyword_check in title_lower
+        ]
+    
+    @staticmethod
+    def _remaining(deadline_at: float) -> float:
+        """距总时限截止还剩的秒数（可能为负）"""
+        return deadline_at - asyncio.get_running_loop().time()
+    
+    @classmethod
+    def _step_timeout(cls, deadline_at: float, step_ms: int) -> int:
+        """步骤超时上限与剩余时间取较小值（毫秒）；Playwright 的 0 表示不限时，至少取 1"""
+        return max(1, int(min(step_ms, cls._remaining(deadline_at) * 1000)))
     
-    async def _check_has_results(self) -> bool:
+    @classmethod
+    def _backoff(cls, attempt: int, deadline_at: float) -> float:
+        """第 attempt 次失败后的退避秒数，不超过上限和剩余时间"""
+        return max(0.0, min(2 ** attempt, _MAX_RETRY_BACKOFF, cls._remaining(deadline_at)))
+    
+    async def _check_has_results(self, timeout: int = _HAS_RESULTS_WAIT_MS) -> bool:
         """
         检查是否有搜索结果
         
+        Args:
+            timeout: 等待结果或空结果提示的超时（毫秒）
+            
         Returns:
             bool: 是否有结果
         """
+        # 商品列表和"未找到相关商品"提示同时等待，任一出现即可判断，
+        # 无结果时不必先等满商品列表的超时
         try:
-            # 检查是否有商品列表
-            result_selector = (
-                ".feeds-list-container--UkIMBPNk a[href*='/item?id='], "
-                "[class*='feeds-list-container'] a[href*='/item?id='], "
-                "a[href*='/item?id=']"
+            await self.browser.page.wait_for_selector(
+                f"{_RESULT_SELECTOR}, {_NO_RESULT_SELECTOR}", timeout=timeout
             )
-            await self.browser.page.wait_for_selector(result_selector, timeout=5000)
+        except PlaywrightTimeoutError:
             return True
-        except:
-            # 检查是否有"未找到相关商品"提示
-            no_result = await self.browser.page.query_selector(".no-result, .empty-state")
-            if no_result:
-                logger.info("未找到相关商品")
-                return False
+        
+        if await self.browser.page.query_selector(_RESULT_SELECTOR):
             return True
+        logger.info("未找到相关商品")
+        return False
     
     async def _parse_search_results(self, limit: int = 20) -> List[XianyuItem]:
         """
         解析搜索结果（增强版 - 确保选择搜索结果而非推荐）
         
+        容器定位、卡片查找、可见性判断和字段提取全部在一次 page.evaluate 中完成，
+        Python 侧只负责把原始字段构建为商品对象。
+        
         Args:
             limit: 最大返回数量
             
@@ -290,71 +646,36 @@ class XianyuSearch:
         items = []
         
         try:
-            # 优先锁定真实商品流容器，避免抓到搜索建议和 SEO 隐藏链接
-            container_selectors = [
-                ".feeds-list-container--UkIMBPNk",
-                "[class*='feeds-list-container']",
-                "[class*='search-result']",
-                "[class*='search-list']",
-                "[class*='goods-list']",
-                "[class*='item-list']",
-            ]
-            
-            container = None
-            for selector in container_selectors:
-                try:
-                    container = await self.browser.page.query_selector(selector)
-                    if container:
-                        logger.debug(f"找到搜索容器：{selector}")
-                        break
-                except:
-                    continue
-            
-            # 多种选择器尝试（在容器内查找）
-            selectors = [
-                "a[href*='/item?id=']",
-                "a[class*='feeds-item-wrap']",
-                "[class*='feeds-item-wrap']",
-                "[class*='card-container']",
-                "[class*='goods-item']",
-                "[class*='item-card']",
-            ]
-            
-            cards = []
-            for selector in selectors:
+            raw = await self.browser.page.evaluate(_SEARCH_RESULTS_SCRIPT, {
+                "containerSelectors": _prefer_first(
+                    self._cached_container_sel, _CONTAINER_SELECTORS
+                ),
+                "cardSelectors": _prefer_first(self._cached_card_sel, _CARD_SELECTORS),
+                "fallbackSelector": _FALLBACK_CARD_SELECTOR,
+                "fields": _CARD_FIELD_SELECTORS,
+                "limit": limit,
+            })
+            
+            # 记住本次命中的选择器；缓存的选择器失效时脚本会继续按原顺序探测，
+            # 这里同步更新（或清空）缓存
+            self._cached_container_sel = raw["containerSelector"]
+            self._cached_card_sel = raw["cardSelector"]
+            
+            if raw["containerSelector"]:
+                logger.debug("找到搜索容器：{}", raw["containerSelector"])
+            if raw["cardSelector"]:
+                logger.debug("使用选择器 '{}' 找到 {} 个商品", raw["cardSelector"], raw["total"])
+            elif raw["total"]:
+                logger.debug("使用备用方案（商品链接）找到 {} 个商品", raw["total"])
+            
+            logger.debug("总共找到 {} 个商品卡片", raw["total"])
+            
+            for i, data in enumerate(raw["items"]):
                 try:
-                    if container:
-                        cards = await container.query_selector_all(selector)
-                    else:
-                        cards = await self.browser.page.query_selector_all(selector)
-                    
-                    if cards:
-                        logger.debug(f"使用选择器 '{selector}' 找到 {len(cards)} 个商品")
-                        break
-                except Exception as e:
-                    logger.debug(f"选择器 '{selector}' 失败：{str(e)[:50]}")
-                    continue
-            
-            # 如果还是没有找到，再做一次全页兜底，但仍然只接受商品详情链接
-            if not cards:
-                cards = await self.browser.page.query_selector_all(
-                    "a[href*='/item?id='], a[href*='/detail/'], a[href*='/goods/']"
-                )
-                if cards:
-                    logger.debug(f"使用备用方案（商品链接）找到 {len(cards)} 个商品")
-            
-            logger.debug(f"总共找到 {len(cards)} 个商品卡片")
-            
-            for i, card in enumerate(cards[:limit]):
-                try:
-                    is_visible = await card.is_visible()
-                    if not is_visible:
-                        continue
-                    
-                    item = await self._parse_single_item(card)
+                    item = self._build_item(data)
                     if item and item.title:
                         items.append(item)
-                        logger.debug(f"解析商品 {i+1}: {item.title[:30]}...")
+                        logger.debug("解析商品 {}: {}...", i + 1, item.title[:30])
                 except Exception as e:
                     logger.debug(f"解析商品失败：{e}")
                     continue
@@ -364,197 +685,85 @@ class XianyuSearch:
         
         return items
     
-    async def _parse_single_item(self, card) -> Optional[XianyuItem]:
+    @staticmethod
+    def _build_item(data: Dict[str, Any]) -> Optional[XianyuItem]:
         """
-        解析单个商品卡片（增强版 - 支持多种选择器 + 详细数据提取）
+        根据页面内提取的原始字段构建商品对象
         
         Args:
-            card: 商品卡片元素
+            data: _CARD_FIELDS_SCRIPT 返回的字段字典
             
         Returns:
-            商品对象
+            商品对象，标题无效时返回 None
         """
-        try:
-            item = XianyuItem()
-            
-            # ========== 1. 提取标题 ==========
-            # 尝试多种选择器
-            title_selectors = [
-                "[class*='main-title']",
-                "[class*='row1-wrap-title']",
-                "[class*='title']",
-                "[class*='name']",
-                "h3",
-                "h4",
-                "div[class*='card'] div:first-child",
-            ]
-            
-            for selector in title_selectors:
-                title_el = await card.query_selector(selector)
-                if title_el:
-                    item.title = (await title_el.inner_text()).strip()[:100]
-                    break
-            
-            if not item.title:
-                title_attr = await card.get_attribute("title")
-                if title_attr:
-                    item.title = title_attr.strip()[:100]
-            
-            # 备用方案：获取整个卡片的文本（排除价格和按钮）
-            if not item.title or len(item.title) < 2:
-                all_text = await card.inner_text()
-                lines = all_text.split('\n')
-                if lines:
-                    item.title = lines[0].strip()[:100]
-            
-            # 如果标题为空，跳过
-            if not item.title or len(item.title) < 2:
-                return None
-            
-            # ========== 2. 提取价格 ==========
-            price_selectors = [
-                "[class*='price-wrap']",
-                "[class*='price']",
-                "span[class*='money']",
-                "[class*='money']",
-                "div[class*='price']",
-            ]
-            
-            for selector in price_selectors:
-                price_el = await card.query_selector(selector)
-                if price_el:
-                    price_text = await price_el.inner_text()
-                    import re
-                    # 匹配价格（支持￥、¥、元等符号）
-                    price_match = re.search(r'[￥¥]?([\d.]+)', price_text)
-                    if price_match:
-                        try:
-                            item.price = float(price_match.group(1))
-                            break
-                        except:
-                            pass
-            
-            # ========== 3. 提取图片 ==========
-            img_el = await card.query_selector("img")
-            if img_el:
-                # 尝试获取高分辨率图片
-                for attr in ['src', 'data-src', 'original-src']:
-                    img_url = await img_el.get_attribute(attr)
-                    if img_url and img_url.startswith('http'):
-                        item.image_url = img_url
-                        break
-            
-            # ========== 4. 提取卖家信息 ==========
-            seller_selectors = [
-                "[class*='seller']",
-                "[class*='user']",
-                "[class*='nick']",
-                "div[class*='user-info']",
-            ]
-            
-            for selector in seller_selectors:
-                seller_el = await card.query_selector(selector)
-                if seller_el:
-                    item.seller_name = (await seller_el.inner_text()).strip()[:50]
+        item = XianyuItem()
+        
+        # ========== 1. 标题 ==========
+        if data["title"] is not None:
+            item.title = data["title"][:100]
+        
+        if not item.title and data["titleAttr"]:
+            item.title = data["titleAttr"].strip()[:100]
+        
+        # 备用方案：取整个卡片文本的第一行
+        if not item.title or len(item.title) < 2:
+            item.title = data["text"].split('\n')[0].strip()[:100]
+        
+        # 如果标题为空，跳过
+        if not item.title or len(item.title) < 2:
+            return None
+        
+        # ========== 2. 价格（支持￥、¥、元等符号） ==========
+        for price_text in data["prices"]:
+            price_match = _PRICE_RE.search(price_text)
+            if price_match:
+                try:
+                    item.price = float(price_match.group(1))
                     break
-            
-            # ========== 5. 提取地区 ==========
-            location_selectors = [
-                "[class*='seller-text']",
-                "[class*='location']",
-                "[class*='area']",
-                "[class*='city']",
-                "div[class*='region']",
-            ]
-            
-            for selector in location_selectors:
-                location_el = await card.query_selector(selector)
-                if location_el:
-                    item.location = (await location_el.inner_text()).strip()[:50]
+                except ValueError:
+                    pass
+        
+        # ========== 3. 图片（依次尝试 src / data-src / original-src） ==========
+        for img_url in data["images"]:
+            if img_url.startswith('http'):
+                item.image_url = img_url
+                break
+        
+        # ========== 4. 卖家 / 5. 地区 ==========
+        if data["seller"] is not None:
+            item.seller_name = data["seller"][:50]
+        if data["location"] is not None:
+            item.location = data["location"][:50]
+        
+        # ========== 6. 想要人数 ==========
+        for want_text in data["wants"]:
+            want_match = _NUM_RE.search(want_text)
+            if want_match:
+                try:
+                    want_num = float(want_match.group(1))
+                    # 处理"万"单位
+                    if '万' in want_text:
+                        want_num *= 10000
+                    item.want_count = int(want_num)
                     break
-            
-            # ========== 6. 提取想要人数 ==========
-            want_selectors = [
-                "[class*='price-desc']",
-                "[class*='want']",
-                "[class*='like']",
-                "[class*='collect']",
-                "span[class*='count']",
-            ]
-            
-            for selector in want_selectors:
-                want_el = await card.query_selector(selector)
-                if want_el:
-                    want_text = await want_el.inner_text()
-                    import re
-                    want_match = re.search(r'([\d.]+)', want_text)
-                    if want_match:
-                        try:
-                            want_num = float(want_match.group(1))
-                            # 处理"万"单位
-                            if '万' in want_text:
-                                want_num *= 10000
-                            item.want_count = int(want_num)
-                            break
-                        except:
-                            pass
-            
-            # ========== 7. 提取商品链接和 ID ==========
-            link_el = card
-            tag_name = await card.evaluate("el => el.tagName")
-            if tag_name != "A":
-                link_el = await card.query_selector("a[href]")
-            if link_el:
-                href = await link_el.get_attribute("href") or ""
-                
-                # 检查是否是商品链接
-                if any(pattern in href for pattern in ['/detail/', '/item?id=', '/goods/']):
-                    item.url = href
-                    
-                    # 提取商品 ID
-                    import re
-                    # 尝试多种 ID 提取模式
-                    id_patterns = [
-                        r'/detail/(\w+)',
-                        r'[?&]id=(\w+)',
-                        r'/goods/(\w+)',
-                        r'id=(\w+)',
-                    ]
-                    
-                    for pattern in id_patterns:
-                        match = re.search(pattern, href)
-                        if match:
-                            item.id = match.group(1)
-                            break
-                    
-                    # 提取 xsec_token
-                    token_match = re.search(r'xsec_token=([^&]+)', href)
-                    if token_match:
-                        item.xsec_token = token_match.group(1)
-            
-            # ========== 8. 提取其他信息 ==========
-            # 提取分类
-            category_el = await card.query_selector("[class*='category'], [class*='tag']")
-            if category_el:
-                item.category = (await category_el.inner_text()).strip()[:50]
-            
-            # 提取描述/副标题
-            desc_el = await card.query_selector("[class*='desc'], [class*='subtitle']")
-            if desc_el:
-                item.description = (await desc_el.inner_text()).strip()[:200]
-            
-            # 提取新旧程度
-            condition_el = await card.query_selector("[class*='condition'], [class*='new']")
-            if condition_el:
-                item.condition = (await condition_el.inner_text()).strip()[:20]
-            
-            return item
-            
-        except Exception as e:
-            logger.debug(f"解析单个商品失败：{e}")
-            import traceback
-            traceback.print_exc()
-            return None
+                except ValueError:
+                    pass
+        
+        # ========== 7. 商品链接和 ID ==========
+        href = data["href"]
+        if any(pattern in href for pattern in _ITEM_LINK_MARKERS):
+            item.url = href
+            item.id, item.xsec_token = _parse_href(href)
+        
+        # ========== 8. 分类 / 描述 / 新旧程度 ==========
+        if data["category"] is not None:
+            item.category = data["category"][:50]
+        if data["desc"] is not None:
+            item.description = data["desc"][:200]
+        if data["condition"] is not None:
+            item.condition = data["condition"][:20]
+        
+        return item
     
     async def get_competitor_prices(self, item_ids: List[str]) -> Dict[str, Dict]:
         """
@@ -568,21 +777,35 @@ class XianyuSearch:
         """
         logger.info(f"获取竞品价格：{len(item_ids)}个商品")
         
-        result = {}
-        for item_id in item_ids:
-            try:
-                # TODO: 实现获取商品详情和价格
-                result[item_id] = {
-                    "price": 0,
-                    "status": "available",
-                }
-            except Exception as e:
-                logger.error(f"获取竞品价格失败 {item_id}: {e}")
-                result[item_id] = {
-                    "error": str(e),
-                }
+        # 各商品详情互不依赖，并发获取并限制同时进行的请求数
+        semaphore = asyncio.Semaphore(_COMPETITOR_CONCURRENCY)
+        
+        async def fetch(item_id: str) -> tuple[str, Dict]:
+            async with semaphore:
+                try:
+                    return item_id, await self._fetch_price_detail(item_id)
+                except Exception as e:
+                    logger.error(f"获取竞品价格失败 {item_id}: {e}")
+                    return item_id, {"error": str(e)}
         
-        return result
+        pairs = await asyncio.gather(*(fetch(item_id) for item_id in item_ids))
+        return dict(pairs)
+    
+    async def _fetch_price_detail(self, item_id: str) -> Dict:
+        """
+        获取单个商品的价格信息
+        
+        Args:
+            item_id: 商品 ID
+            
+        Returns:
+            价格信息
+        """
+        # TODO: 实现获取商品详情和价格
+        return {
+            "price": 0,
+            "status": "available",
+        }
     
     async def get_hot_items(self, category: str = "", limit: int = 20) -> List[XianyuItem]:
         """
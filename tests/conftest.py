@@ -0,0 +1,125 @@
+"""
+pytest 公共夹具
+
+浏览器在整个测试会话中只启动一次，各测试共享同一实例
+"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+import pytest_asyncio
+
+try:
+    import uvloop
+except ImportError:  # 可选依赖（Windows 不支持），未安装时使用默认事件循环
+    uvloop = None
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from helpers import DUMMY_JPEG_BYTES, TestSuite, load_storage_state, make_fake_browser
+
+if TYPE_CHECKING:
+    from xianyu_mcp.xianyu.browser import XianyuBrowser
+
+# 复制用户数据目录时跳过 Chromium 的进程锁和缓存
+_PROFILE_COPY_IGNORE = shutil.ignore_patterns("Singleton*", "lockfile", "*Cache*")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="运行访问闲鱼真实站点的 live 测试",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """安装了 uvloop 时在会话开始前设置一次全局事件循环策略，pytest-asyncio 据此创建循环"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list) -> None:
+    """未指定 --live 时跳过 live 测试，避免网络或站点状态影响默认测试结果"""
+    if config.getoption("--live"):
+        return
+    
+    skip_live = pytest.mark.skip(reason="访问真实站点，使用 --live 运行")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_browser():
+    """整个会话共用的浏览器实例"""
+    # 在夹具内导入，收集阶段和只跑离线用例时不加载 Playwright
+    from xianyu_mcp.xianyu.browser import XianyuBrowser
+    
+    browser = XianyuBrowser(headless=True)
+    try:
+        await browser.launch()
+        # 24 小时内保存过登录态时直接复用，各测试不必重复加载 Cookie
+        await load_storage_state(browser)
+        yield browser
+    finally:
+        await browser.close()
+
+
+@pytest_asyncio.fixture
+async def browser(shared_browser: "XianyuBrowser"):
+    """共享浏览器；测试结束后回到空白页，避免导航状态影响后续测试"""
+    yield shared_browser
+    if shared_browser.page:
+        await shared_browser.page.goto("about:blank")
+
+
+@pytest.fixture
+def isolated_profile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    为自行启动浏览器的 MCP 工具准备独立的用户数据目录
+    
+    会话级共享浏览器占用着默认目录（Chromium 会锁定它），这里复制一份
+    登录态后把 settings.user_data_dir 指向副本。
+    """
+    from xianyu_mcp.config import settings
+    
+    profile = tmp_path / "user_data"
+    if settings.user_data_dir.exists():
+        try:
+            shutil.copytree(settings.user_data_dir, profile, ignore=_PROFILE_COPY_IGNORE)
+        except shutil.Error:
+            # 正在写入的文件可能复制失败，其余文件已复制完成
+            pass
+    monkeypatch.setattr(settings, "user_data_dir", profile)
+    return profile
+
+
+@pytest.fixture
+def fake_browser() -> "XianyuBrowser":
+    """不启动 Chromium 的模拟浏览器，供只验证 Python 侧逻辑的测试使用"""
+    return make_fake_browser()
+
+
+@pytest.fixture(scope="session")
+def dummy_image(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """会话内共用的测试图片，只在首次使用时写入一次"""
+    path = tmp_path_factory.mktemp("img") / "test.jpg"
+    path.write_bytes(DUMMY_JPEG_BYTES)
+    return path
+
+
+@pytest.fixture
+def suite():
+    """收集测试结果，测试结束时把失败结果转为 pytest 失败"""
+    suite = TestSuite()
+    yield suite
+    failed = [str(result) for result in suite.results if not result.passed]
+    if failed:
+        pytest.fail("\n".join(failed))
@@ -0,0 +1,234 @@
+"""
+测试公共工具
+
+测试结果收集、模拟浏览器、登录态缓存等供 conftest.py 和各测试脚本共用的辅助代码，
+本模块不包含测试用例。
+"""
+
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional
+
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+if TYPE_CHECKING:
+    from xianyu_mcp.xianyu.browser import XianyuBrowser
+
+
+def write_json(path: Path, data: Any) -> None:
+    """以 UTF-8、两空格缩进写出 JSON，安装了 orjson 时用其 C 实现编码"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# 最小 JPEG 文件头，发布参数验证只需要一个真实存在的图片文件
+DUMMY_JPEG_BYTES = b"\xff\xd8\xff\xe0" + b"\0" * 32
+
+# 模拟的搜索页解析结果（_SEARCH_RESULTS_SCRIPT 一次 page.evaluate 的返回值）
+FAKE_SEARCH_RESULTS = {
+    "containerSelector": ".search-container",
+    "cardSelector": ".feeds-item-wrap",
+    "total": 2,
+    "items": [
+        {
+            "title": "iPhone 13 128G 国行",
+            "titleAttr": "",
+            "text": "iPhone 13 128G 国行\n¥2999\n12人想要",
+            "prices": ["¥2999"],
+            "images": ["https://img.alicdn.com/test_1.jpg"],
+            "wants": ["12人想要"],
+            "seller": "测试卖家",
+            "location": "上海",
+            "href": "https://www.goofish.com/item?id=100000000001&xsec_token=abc",
+            "category": None,
+            "desc": None,
+            "condition": "9成新",
+        },
+        {
+            "title": "华为 Mate 40 Pro",
+            "titleAttr": "",
+            "text": "华为 Mate 40 Pro\n¥1500\n1.2万人想要",
+            "prices": ["¥1500"],
+            "images": ["//img.alicdn.com/test_2.jpg"],
+            "wants": ["1.2万人想要"],
+            "seller": None,
+            "location": "北京",
+            "href": "https://www.goofish.com/item?id=100000000002",
+            "category": None,
+            "desc": None,
+            "condition": None,
+        },
+    ],
+}
+
+
+def make_fake_browser() -> "XianyuBrowser":
+    """
+    构造不启动 Chromium 的模拟浏览器
+    
+    page 上的异步方法立即返回，page.evaluate 返回 FAKE_SEARCH_RESULTS，
+    用于只验证 Python 侧调用和解析逻辑的测试。
+    """
+    from unittest.mock import AsyncMock, MagicMock
+    from xianyu_mcp.xianyu.browser import XianyuBrowser
+    
+    browser = AsyncMock(spec=XianyuBrowser)
+    browser.browser = AsyncMock()
+    browser.page = AsyncMock()
+    # Playwright 的事件注册是同步方法
+    browser.page.on = MagicMock()
+    browser.page.evaluate.return_value = FAKE_SEARCH_RESULTS
+    return browser
+
+
+# 登录态缓存：登录检查通过后保存，24 小时内的后续会话直接复用
+STORAGE_STATE_FILE = Path(__file__).parent / ".storage_state.json"
+STORAGE_STATE_MAX_AGE = 24 * 60 * 60
+
+
+async def load_storage_state(browser: "XianyuBrowser") -> bool:
+    """
+    把缓存的登录态写入浏览器上下文
+    
+    浏览器使用持久化上下文，无法在启动时传入 storage_state，
+    因此只恢复其中的 Cookie。
+    
+    Returns:
+        bool: 缓存存在、未过期且已加载时返回 True
+    """
+    if not browser.browser or not STORAGE_STATE_FILE.exists():
+        return False
+    
+    if time.time() - STORAGE_STATE_FILE.stat().st_mtime > STORAGE_STATE_MAX_AGE:
+        logger.info("登录态缓存已超过 24 小时，忽略")
+        return False
+    
+    try:
+        with open(STORAGE_STATE_FILE, "r", encoding="utf-8") as f:
+            cookies = json.load(f).get("cookies", [])
+        if not cookies:
+            return False
+        await browser.browser.add_cookies(cookies)
+    except Exception as e:
+        logger.warning(f"加载登录态缓存失败：{e}")
+        return False
+    
+    logger.info(f"已从 {STORAGE_STATE_FILE} 恢复登录态")
+    return True
+
+
+def _format_ms(duration_ns: int) -> str:
+    """纳秒耗时格式化为保留一位小数的毫秒字符串"""
+    return f"{duration_ns / 1_000_000:.1f}"
+
+
+@dataclass(slots=True)
+class TestResult:
+    """测试结果"""
+    __test__ = False  # 名称以 Test 开头，避免被 pytest 当作测试类收集
+    name: str
+    passed: bool
+    message: str = ""
+    duration: int = 0  # 纳秒（perf_counter_ns 差值）
+    timestamp: datetime = field(default_factory=datetime.now)
+    
+    def __str__(self) -> str:
+        status = "PASS" if self.passed else "FAIL"
+        return f"[{status}] {self.name} ({_format_ms(self.duration)}ms) - {self.message}"
+    
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "message": self.message,
+            "duration_ms": _format_ms(self.duration),
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
+class Summary(NamedTuple):
+    """测试摘要（不可变，写入报告时用 _asdict() 转为字典）"""
+    total: int
+    passed: int
+    failed: int
+    success_rate: str
+    total_duration_ms: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+
+
+class TestSuite:
+    """测试套件"""
+    __test__ = False  # 名称以 Test 开头，避免被 pytest 当作测试类收集
+    
+    def __init__(self):
+        self.results: List[TestResult] = []
+        self.start_time = None
+        self.end_time = None
+        # 随 add_result 增量维护，get_summary 无需再遍历结果
+        self._passed = 0
+        self._total_duration = 0
+    
+    def add_result(self, result: TestResult):
+        """添加测试结果"""
+        self.results.append(result)
+        self._passed += result.passed
+        self._total_duration += result.duration
+        status = "[OK]" if result.passed else "[FAIL]"
+        logger.info(f"{status} {result.name}: {result.message}")
+    
+    def get_summary(self) -> Summary:
+        """获取测试摘要"""
+        total = len(self.results)
+        passed = self._passed
+        success_rate = (passed / total * 100) if total > 0 else 0
+        
+        return Summary(
+            total=total,
+            passed=passed,
+            failed=total - passed,
+            success_rate=f"{success_rate:.1f}%",
+            total_duration_ms=_format_ms(self._total_duration),
+            start_time=self.start_time.isoformat() if self.start_time else None,
+            end_time=self.end_time.isoformat() if self.end_time else None,
+        )
+    
+    def print_report(self, summary: Optional[Summary] = None):
+        """
+        打印测试报告
+        
+        Args:
+            summary: 已生成的测试摘要，未传入时现场生成
+        """
+        print("\n" + "=" * 60)
+        print("测试报告")
+        print("=" * 60)
+        
+        for result in self.results:
+            print(result)
+        
+        print()
+        print("-" * 60)
+        summary = summary or self.get_summary()
+        print(f"总计：{summary.total} 个测试")
+        print(f"通过：{summary.passed} 个 [OK]")
+        print(f"失败：{summary.failed} 个 [FAIL]")
+        print(f"成功率：{summary.success_rate}")
+        print(f"总耗时：{summary.total_duration_ms}ms")
+        print("=" * 60)
@@ -5,13 +5,18 @@
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
+import pytest
+from loguru import logger
+
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+# 访问真实站点；MCP 工具自行启动浏览器，需要独立的用户数据目录
+pytestmark = [pytest.mark.live, pytest.mark.usefixtures("isolated_profile")]
+
 
 TEST_ITEM_IDS = [
     "966781426236",
@@ -19,7 +24,8 @@ TEST_ITEM_IDS = [
 ]
 
 
-async def main():
+async def test_analytics_tools():
+    """验证商品统计和竞品分析工具的返回结构"""
     from xianyu_mcp.server import analyze_competitors, get_item_analytics
 
     print("=" * 60)
@@ -27,14 +33,18 @@ async def main():
     print("=" * 60)
     print()
 
+    # 两个工具各自用同一用户数据目录启动持久化浏览器，Chromium 会锁定该目录，
+    # 同时启动第二个会失败，因此只能依次调用
     print(f"[测试] 获取商品统计：{TEST_ITEM_IDS[0]} ...")
     item_result = await get_item_analytics(TEST_ITEM_IDS[0])
-    print(json.dumps(item_result, ensure_ascii=True))
+    logger.info("商品统计结果：{}", item_result)
+    assert "error" not in item_result, f"商品统计失败：{item_result.get('error')}"
 
     print()
     print(f"[测试] 竞品分析：{TEST_ITEM_IDS} ...")
     competitor_result = await analyze_competitors(TEST_ITEM_IDS)
-    print(json.dumps(competitor_result, ensure_ascii=True))
+    logger.info("竞品分析结果：{}", competitor_result)
+    assert competitor_result["analyzed_items"] > 0, competitor_result["message"]
 
     print()
     print("=" * 60)
@@ -43,4 +53,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(test_analytics_tools())
@@ -8,70 +8,76 @@ import asyncio
 import sys
 from pathlib import Path
 
+import pytest
+
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-async def test_mcp_search():
-    """测试 MCP 搜索功能"""
+# 访问真实站点；MCP 工具自行启动浏览器，需要独立的用户数据目录
+pytestmark = [pytest.mark.live, pytest.mark.usefixtures("isolated_profile")]
+
+
+async def run_mcp_search() -> list:
+    """调用 MCP 搜索工具并打印结果"""
     print("=" * 60)
     print("MCP 搜索功能测试 - cursor pro")
     print("=" * 60)
     print()
     
-    try:
-        # 导入 MCP 服务器中的搜索工具
-        from xianyu_mcp.server import search_items
-        
-        print("[1/3] 调用 MCP 搜索工具...")
-        results = await search_items(
-            keyword="cursor pro",
-            limit=5
-        )
-        
-        print(f"[2/3] 收到 {len(results)} 个结果")
-        print()
-        print("[3/3] 结果详情:")
-        print()
-        
-        if results:
-            for i, item in enumerate(results[:5], 1):
-                print(f"{i}. {item.get('title', 'N/A')[:50]}")
-                print(f"   价格: RMB {item.get('price', 'N/A')}")
-                print(f"   位置：{item.get('location', 'N/A')}")
-                print(f"   想要：{item.get('want_count', 'N/A')}人")
-                print()
-        else:
-            print("未找到相关商品")
+    # 导入 MCP 服务器中的搜索工具
+    from xianyu_mcp.server import search_items
+    
+    print("[1/3] 调用 MCP 搜索工具...")
+    results = await search_items(
+        keyword="cursor pro",
+        limit=5
+    )
+    
+    print(f"[2/3] 收到 {len(results)} 个结果")
+    print()
+    print("[3/3] 结果详情:")
+    print()
+    
+    if results:
+        for i, item in enumerate(results[:5], 1):
+            print(f"{i}. {item.get('title', 'N/A')[:50]}")
+            print(f"   价格: RMB {item.get('price', 'N/A')}")
+            print(f"   位置：{item.get('location', 'N/A')}")
+            print(f"   想要：{item.get('want_count', 'N/A')}人")
             print()
-            print("可能原因:")
-            print("1. 关键词无结果")
-            print("2. 选择器需要调整")
-            print("3. 页面结构变化")
-        
-        print("=" * 60)
-        print("测试完成")
-        print("=" * 60)
-        
-        return results
-        
-    except Exception as e:
-        print(f"[ERROR] 测试失败：{e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    else:
+        print("未找到相关商品")
+        print()
+        print("可能原因:")
+        print("1. 关键词无结果")
+        print("2. 选择器需要调整")
+        print("3. 页面结构变化")
+    
+    print("=" * 60)
+    print("测试完成")
+    print("=" * 60)
+    
+    return results
+
+
+async def test_mcp_search():
+    """测试 MCP 搜索功能"""
+    results = await run_mcp_search()
+    
+    assert results, "MCP 搜索未返回商品"
+    assert all(item.get("title") for item in results), "存在缺少标题的商品"
 
 
 if __name__ == "__main__":
-    results = asyncio.run(test_mcp_search())
+    results = asyncio.run(run_mcp_search())
     
     # 保存结果
-    import json
+    from helpers import write_json
     result_file = Path(__file__).parent / "search_result.json"
-    with open(result_file, "w", encoding="utf-8") as f:
-        json.dump({
-            "keyword": "cursor pro",
-            "count": len(results),
-            "items": results
-        }, f, ensure_ascii=False, indent=2)
+    write_json(result_file, {
+        "keyword": "cursor pro",
+        "count": len(results),
+        "items": results
+    })
     
     print(f"\n结果已保存到：{result_file}")
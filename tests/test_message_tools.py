@@ -5,15 +5,21 @@
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
+import pytest
+from loguru import logger
+
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+# 访问真实站点；MCP 工具自行启动浏览器，需要独立的用户数据目录
+pytestmark = [pytest.mark.live, pytest.mark.usefixtures("isolated_profile")]
+
 
-async def main():
+async def test_message_tools():
+    """验证消息类工具的返回结构"""
     from xianyu_mcp.server import (
         get_conversations,
         get_messages,
@@ -25,34 +31,29 @@ async def main():
     print("=" * 60)
     print()
 
-    print("[测试] 获取可发送会话（不预热）...")
-    sendable = await get_sendable_conversations(limit=3, warm_context=False)
-    print(json.dumps(sendable, ensure_ascii=True))
-
-    if not sendable.get("success"):
-        print("[WARN] 获取可发送会话失败，后续测试跳过")
-        return
-
-    print()
+    # 预热路径包含不预热时的全部抓取逻辑，只调用一次，避免重复拉取会话列表
     print("[测试] 获取可发送会话（预热上下文）...")
-    warmed = await get_sendable_conversations(limit=3, warm_context=True)
-    print(json.dumps(warmed, ensure_ascii=True))
+    sendable = await get_sendable_conversations(limit=3, warm_context=True)
+    logger.info("可发送会话：{}", sendable)
+    assert sendable["success"], f"获取可发送会话失败：{sendable['message']}"
 
     target_id = ""
-    items = warmed.get("items") or sendable.get("items") or []
+    items = sendable.get("items") or []
     if items:
         target_id = items[0].get("id", "")
 
     print()
     print("[测试] 获取会话列表（仅可发送）...")
     conversations = await get_conversations(limit=5, sendable_only=True, context_only=False)
-    print(json.dumps(conversations, ensure_ascii=True))
+    logger.info("会话列表：{}", conversations)
+    assert conversations["success"], f"获取会话列表失败：{conversations['message']}"
 
     if target_id:
         print()
         print(f"[测试] 获取会话消息：{target_id} ...")
         messages = await get_messages(conversation_id=target_id, limit=3)
-        print(json.dumps(messages, ensure_ascii=True))
+        logger.info("会话消息：{}", messages)
+        assert messages["success"], f"获取会话消息失败：{messages['message']}"
     else:
         print()
         print("[WARN] 没有可用会话，跳过消息读取测试")
@@ -64,4 +65,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(test_message_tools())
@@ -4,13 +4,30 @@
 
 import asyncio
 import sys
-import json
+import re
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-async def precise_search():
+if TYPE_CHECKING:
     from xianyu_mcp.xianyu.browser import XianyuBrowser
+
+# 访问真实站点，默认跳过
+pytestmark = pytest.mark.live
+
+
+FILTER_KEYWORDS = ["账号", "pro", "会员", "订阅"]
+
+# 过滤结果的独立预期：标题命中任一过滤词（忽略大小写），只编译一次
+FILTER_RE = re.compile("|".join(map(re.escape, FILTER_KEYWORDS)), re.IGNORECASE)
+
+
+async def test_precise_search(browser: "XianyuBrowser"):
+    """精确匹配与过滤关键词搜索（使用会话共享的浏览器）"""
+    from helpers import write_json
     from xianyu_mcp.xianyu.search import XianyuSearch
     
     print("=" * 60)
@@ -18,95 +35,95 @@ async def precise_search():
     print("=" * 60)
     print()
     
+    search = XianyuSearch(browser)
+    
+    # 测试 1: 精确匹配
+    print("Test 1: Searching 'cursor pro' with exact match")
+    print("-" * 60)
+    items1 = await search.search(
+        keyword="cursor pro",
+        limit=10,
+        exact_match=True
+    )
+    print(f"Found {len(items1)} items (exact match)")
+    for i, item in enumerate(items1[:5], 1):
+        print(f"  {i}. {item.title[:50]}")
+    print()
+    
+    # 测试 2/3 共用同一次 "cursor" 搜索：页面只抓取一次，过滤在本地完成，
+    # 与 search(filter_keywords=...) 内部的过滤逻辑一致
+    items3 = await search.search(
+        keyword="cursor",
+        limit=10
+    )
+    
+    # 测试 2: 带过滤关键词
+    print("Test 2: Searching 'cursor' with filter keywords")
+    print("-" * 60)
+    items2 = search._filter_items(items3, "cursor", FILTER_KEYWORDS)
+    print(f"Found {len(items2)} items (filtered)")
+    for i, item in enumerate(items2[:5], 1):
+        print(f"  {i}. {item.title[:50]}")
+    print()
+    
+    # 测试 3: 普通搜索（对比）
+    print("Test 3: Searching 'cursor' without filter (comparison)")
+    print("-" * 60)
+    print(f"Found {len(items3)} items (no filter)")
+    for i, item in enumerate(items3[:5], 1):
+        print(f"  {i}. {item.title[:50]}")
+    print()
+    
+    # Save results
+    result_file = Path(__file__).parent / "precise_search_results.json"
+    write_json(result_file, {
+        "exact_match": {
+            "keyword": "cursor pro",
+            "count": len(items1),
+            "items": [item.to_dict() for item in items1]
+        },
+        "filtered": {
+            "keyword": "cursor",
+            "filters": FILTER_KEYWORDS,
+            "count": len(items2),
+            "items": [item.to_dict() for item in items2]
+        },
+        "no_filter": {
+            "keyword": "cursor",
+            "count": len(items3),
+            "items": [item.to_dict() for item in items3]
+        }
+    })
+    
+    print(f"Results saved to: {result_file}")
+    
+    # Summary
+    print()
+    print("=" * 60)
+    print("Summary")
+    print("=" * 60)
+    print(f"Exact match: {len(items1)} items")
+    print(f"Filtered: {len(items2)} items")
+    print(f"No filter: {len(items3)} items")
+    
+    assert items3, "'cursor' 搜索未返回商品"
+    assert all("cursor pro" in item.title.lower() for item in items1), (
+        "精确匹配结果中存在标题不含关键词的商品"
+    )
+    expected2 = [item for item in items3 if FILTER_RE.search(item.title)]
+    assert items2 == expected2, f"过滤结果与关键词模式不一致：{len(items2)} != {len(expected2)}"
+
+
+async def main():
+    from xianyu_mcp.xianyu.browser import XianyuBrowser
+    
     browser = XianyuBrowser(headless=True)
     try:
         await browser.launch()
-        search = XianyuSearch(browser)
-        
-        # 测试 1: 精确匹配
-        print("Test 1: Searching 'cursor pro' with exact match")
-        print("-" * 60)
-        items1 = await search.search(
-            keyword="cursor pro",
-            limit=10,
-            exact_match=True
-        )
-        print(f"Found {len(items1)} items (exact match)")
-        for i, item in enumerate(items1[:5], 1):
-            print(f"  {i}. {item.title[:50]}")
-        print()
-        
-        # 测试 2: 带过滤关键词
-        print("Test 2: Searching 'cursor' with filter keywords")
-        print("-" * 60)
-        items2 = await search.search(
-            keyword="cursor",
-            limit=10,
-            filter_keywords=["账号", "pro", "会员", "订阅"]
-        )
-        print(f"Found {len(items2)} items (filtered)")
-        for i, item in enumerate(items2[:5], 1):
-            print(f"  {i}. {item.title[:50]}")
-        print()
-        
-        # 测试 3: 普通搜索（对比）
-        print("Test 3: Searching 'cursor' without filter (comparison)")
-        print("-" * 60)
-        items3 = await search.search(
-            keyword="cursor",
-            limit=10
-        )
-        print(f"Found {len(items3)} items (no filter)")
-        for i, item in enumerate(items3[:5], 1):
-            print(f"  {i}. {item.title[:50]}")
-        print()
-        
-        # Save results
-        result_file = Path(__file__).parent / "precise_search_results.json"
-        with open(result_file, "w", encoding="utf-8") as f:
-            json.dump({
-                "exact_match": {
-                    "keyword": "cursor pro",
-                    "count": len(items1),
-                    "items": [item.to_dict() for item in items1]
-                },
-                "filtered": {
-                    "keyword": "cursor",
-                    "filters": ["账号", "pro", "会员", "订阅"],
-                    "count": len(items2),
-                    "items": [item.to_dict() for item in items2]
-                },
-                "no_filter": {
-                    "keyword": "cursor",
-                    "count": len(items3),
-                    "items": [item.to_dict() for item in items3]
-                }
-            }, f, ensure_ascii=False, indent=2)
-        
-        print(f"Results saved to: {result_file}")
-        
-        # Summary
-        print()
-        print("=" * 60)
-        print("Summary")
-        print("=" * 60)
-        print(f"Exact match: {len(items1)} items")
-        print(f"Filtered: {len(items2)} items")
-        print(f"No filter: {len(items3)} items")
-        print()
-        print("Conclusion:")
-        if len(items2) > 0:
-            print("  [OK] Filtered search found relevant items!")
-        else:
-            print("  [WARN] No relevant items found, try different keywords")
-        
-    except Exception as e:
-        print(f"[ERROR] {e}")
-        import traceback
-        traceback.print_exc()
+        await test_precise_search(browser)
     finally:
         await browser.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(precise_search())
+    asyncio.run(main())